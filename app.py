@@ -1,5 +1,5 @@
+import argparse
 import sys
-import cv2
 import numpy as np
 import time
 from collections import deque
@@ -10,79 +10,49 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtCore import QTimer
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 
 from core.video_source import VideoSource
-from core.face import FaceLandmarkDetector
-from core.roi import ROIExtractor
 
-from rppg.green import GreenRPPG
-from rppg.filters import bandpass
-from physiology.peaks import detect_peaks
-from physiology.hrv import compute_hr, rmssd
-from stress.index import compute_stress_index
+from pipeline.metrics import Metrics, MetricsServer
+from ui.plot import SeriesPlot
+from ui.preview import render_preview
+from ui.worker import PipelineWorker
 
 
-FPS = 30
-GRAPH_UPDATE_INTERVAL = 1000 
+PREVIEW_FPS = 30
 SUMMARY_INTERVAL = 30
-
-PLOTLY_HTML = """
-<html>
-<head>
-<script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-</head>
-<body style="margin:0;background:#111;">
-<div id="plot"></div>
-<script>
-var layout = {
-    title: "%s",
-    height: 110,
-    paper_bgcolor: "#111",
-    plot_bgcolor: "#111",
-    font: {color: "#ddd"},
-    margin: {l:35,r:15,t:35,b:25}
-};
-var trace = { y: [], mode: "lines", line: {color: "%s"} };
-Plotly.newPlot("plot", [trace], layout);
-</script>
-</body>
-</html>
-"""
+HISTORY = 60
 
 
 class StressDashboard(QWidget):
-    def __init__(self):
+    def __init__(self, metrics_port=None, metrics_jsonl=None,
+                 history=HISTORY, preview_fps=PREVIEW_FPS):
         super().__init__()
         self.setWindowTitle("Real-Time Stress Monitoring Dashboard")
         self.setGeometry(50, 50, 1500, 850)
 
-        # -------- VIDEO PIPELINE -------- #
-        self.vs = None
-        self.face = FaceLandmarkDetector()
-        self.roi = ROIExtractor()
-        self.rppg = GreenRPPG(FPS)
-
-        self.frame_timer = QTimer()
-        self.frame_timer.timeout.connect(self.update_frame)
-
-        self.graph_timer = QTimer()
-        self.graph_timer.timeout.connect(self.update_graphs)
-
-        # -------- SIGNAL BUFFERS -------- #
-        self.pulse_buffer = []
-        self.hr_history = deque(maxlen=60)
-        self.rmssd_history = deque(maxlen=60)
-        self.stress_history = deque(maxlen=60)
-
-        self.last_hr = None
-        self.last_rmssd = None
-        self.last_stress = None
+        # -------- VIDEO PIPELINE (worker thread) -------- #
+        self.worker = None
+        self.history = history
+        self.preview_fps = preview_fps
+        self.hr_history = deque(maxlen=history)
+        self.rmssd_history = deque(maxlen=history)
+        self.stress_history = deque(maxlen=history)
+
+        # -------- INSTRUMENTATION -------- #
+        self.metrics = Metrics(jsonl_path=metrics_jsonl)
+        self.metrics_server = None
+        if metrics_port is not None:
+            self.metrics_server = MetricsServer(
+                self.metrics, port=metrics_port
+            ).start()
+
+        self.render_timer = QTimer()
+        self.render_timer.timeout.connect(self.render_frame)
 
         self.start_time = time.time()
 
         self.init_ui()
-        self.init_graphs()
         self.apply_theme()
 
     # ---------------- UI ---------------- #
@@ -106,7 +76,7 @@ class StressDashboard(QWidget):
 
         self.log_box = QTextEdit()
         self.log_box.setReadOnly(True)
-        self.log_box.setFixedHeight(140)
+        self.log_box.setFixedHeight(220)
 
         self.summary_label = QLabel("30s summary...")
         self.summary_label.setFrameStyle(QFrame.Shape.Box)
@@ -117,14 +87,14 @@ class StressDashboard(QWidget):
         left.addWidget(self.log_box)
         left.addWidget(self.summary_label)
 
-        self.bpm_view = QWebEngineView()
-        self.stress_view = QWebEngineView()
-        self.hrv_view = QWebEngineView()
+        self.plot = SeriesPlot([
+            ("Heart Rate (BPM)", "#00ffcc"),
+            ("Stress Index", "#ff5555"),
+            ("HRV (RMSSD)", "#ffaa00"),
+        ], history=self.history)
 
         right = QVBoxLayout()
-        right.addWidget(self.bpm_view)
-        right.addWidget(self.stress_view)
-        right.addWidget(self.hrv_view)
+        right.addWidget(self.plot)
 
         main = QHBoxLayout()
         main.addLayout(left, 2)
@@ -147,11 +117,7 @@ class StressDashboard(QWidget):
 
     def start_webcam(self):
         self.stop()
-        self.vs = VideoSource(0)
-        self.vs.open()
-        self.start_time = time.time()
-        self.frame_timer.start(1000 // FPS)
-        self.graph_timer.start(GRAPH_UPDATE_INTERVAL)
+        self.start_worker(VideoSource(0, threaded=True), pace=False)
 
     def open_video(self):
         self.stop()
@@ -159,91 +125,78 @@ class StressDashboard(QWidget):
             self, "Select Video", "", "Video Files (*.mp4 *.avi *.mov)"
         )
         if path:
-            self.vs = VideoSource(path)
-            self.vs.open()
-            self.start_time = time.time()
-            self.frame_timer.start(1000 // FPS)
-            self.graph_timer.start(GRAPH_UPDATE_INTERVAL)
-
-    def stop(self):
-        self.frame_timer.stop()
-        self.graph_timer.stop()
-        if self.vs:
-            self.vs.release()
-        self.vs = None
-
-    # ---------------- FRAME LOOP ---------------- #
-
-    def update_frame(self):
-        if not self.vs:
-            return
-
-        frame = self.vs.read()
-        if frame is None:
-            self.stop()
-            return
+            self.start_worker(VideoSource(path), pace=True)
 
-        landmarks, bbox = self.face.process(frame)
+    def start_worker(self, vs, pace):
+        vs.open()
+        self.worker = PipelineWorker(
+            vs, vs.fps, history=self.history, pace=pace, metrics=self.metrics
+        )
+        self.worker.beat.connect(self.on_beat)
+        self.worker.stream_ended.connect(self.stop)
+        self.worker.start()
 
-        if bbox:
-            x1, y1, x2, y2 = bbox
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
+        self.start_time = time.time()
+        self.render_timer.start(int(1000 / self.preview_fps))
 
-        if landmarks is not None:
-            roi_pixels, roi_mask = self.roi.extract(frame, landmarks)
+    def stop(self):
+        self.render_timer.stop()
+        if self.worker:
+            self.worker.stop()
+        self.worker = None
 
-            # -------- ROI VISUAL OVERLAY (LOOK ONLY) -------- #
-            overlay = frame.copy()
-            overlay[roi_mask == 255] = (0, 255, 0)
-            frame = cv2.addWeighted(frame, 0.75, overlay, 0.25, 0)
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
 
-            signal = self.rppg.update(roi_pixels)
-            if signal is not None:
-                filtered = bandpass(signal, FPS)
-                self.pulse_buffer = filtered[-240:]
+    # ---------------- RENDER LOOP ---------------- #
 
-            if len(self.pulse_buffer) > FPS:
-                peaks = detect_peaks(np.array(self.pulse_buffer), FPS)
-                if peaks is not None:
-                    rr = np.diff(peaks / FPS)[-10:]
-                    if len(rr) >= 2:
-                        self.last_hr = compute_hr(rr)
-                        self.last_rmssd = rmssd(rr)
+    def render_frame(self):
+        if not self.worker:
+            return
 
-                        self.hr_history.append(self.last_hr)
-                        self.rmssd_history.append(self.last_rmssd)
+        # Latest result wins: anything analysed since the last tick and
+        # not yet shown has already been superseded
+        result = self.worker.take()
+        if result is None:
+            return
 
-                        self.last_stress = compute_stress_index(
-                            self.last_hr,
-                            self.last_rmssd,
-                            list(self.hr_history)
-                        )
-                        self.stress_history.append(self.last_stress)
+        with self.metrics.stage("render"):
+            preview = render_preview(
+                result.frame,
+                (self.video_label.width(), self.video_label.height()),
+                bbox=result.bbox, roi=result.roi,
+            )
+            self.display(preview)
 
-        self.display(frame)
-        self.update_log()
-        self.check_summary()
+            # Capture -> on screen, and how much of that was analysis
+            now = time.monotonic()
+            self.metrics.set(
+                "pipeline_lag_ms", round(1e3 * (now - result.timestamp), 1)
+            )
+            self.metrics.set(
+                "analysis_ms",
+                round(1e3 * (result.processed - result.timestamp), 1)
+            )
+            self.update_log(result)
+            self.check_summary()
 
     # ---------------- DISPLAY ---------------- #
 
-    def display(self, frame):
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        img = QImage(rgb.data, w, h, ch * w, QImage.Format.Format_RGB888)
-        self.video_label.setPixmap(
-            QPixmap.fromImage(img).scaled(
-                self.video_label.width(),
-                self.video_label.height()
-            )
-        )
+    def display(self, preview):
+        # Already preview-sized BGR: no colour conversion, no rescale
+        h, w, ch = preview.shape
+        img = QImage(preview.data, w, h, ch * w, QImage.Format.Format_BGR888)
+        self.video_label.setPixmap(QPixmap.fromImage(img))
 
     # ---------------- LOG & SUMMARY ---------------- #
 
-    def update_log(self):
+    def update_log(self, result):
         self.log_box.setText(
-            f"HR (BPM): {self.last_hr}\n"
-            f"RMSSD: {self.last_rmssd}\n"
-            f"Stress Index: {self.last_stress}"
+            f"HR (BPM): {result.hr}\n"
+            f"RMSSD: {result.rmssd}\n"
+            f"Stress Index: {result.stress}\n\n"
+            f"{self.metrics.summary()}"
         )
 
     def check_summary(self):
@@ -259,23 +212,30 @@ class StressDashboard(QWidget):
 
     # ---------------- GRAPHS ---------------- #
 
-    def init_graphs(self):
-        self.bpm_view.setHtml(PLOTLY_HTML % ("Heart Rate (BPM)", "#00ffcc"))
-        self.stress_view.setHtml(PLOTLY_HTML % ("Stress Index", "#ff5555"))
-        self.hrv_view.setHtml(PLOTLY_HTML % ("HRV (RMSSD)", "#ffaa00"))
-
-    def update_graphs(self):
-        self.update_plot(self.bpm_view, self.hr_history)
-        self.update_plot(self.stress_view, self.stress_history)
-        self.update_plot(self.hrv_view, self.rmssd_history)
-
-    def update_plot(self, view, data):
-        js = f"Plotly.update('plot', {{y: [{list(data)}]}});"
-        view.page().runJavaScript(js)
+    def on_beat(self, hr, stress, rmssd):
+        # Append-only: one point per series per beat; repaint is deferred
+        self.hr_history.append(hr)
+        self.stress_history.append(stress)
+        self.rmssd_history.append(rmssd)
+        self.plot.append((hr, stress, rmssd))
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = StressDashboard()
+    parser = argparse.ArgumentParser(description="Stress dashboard")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on localhost:PORT")
+    parser.add_argument("--metrics-jsonl", default=None,
+                        help="append a metrics snapshot here every 10 s")
+    parser.add_argument("--history", type=int, default=HISTORY,
+                        help="beats shown in the graphs and summary")
+    parser.add_argument("--preview-fps", type=float, default=PREVIEW_FPS,
+                        help="video preview rate, independent of analysis")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = StressDashboard(
+        args.metrics_port, args.metrics_jsonl, history=args.history,
+        preview_fps=args.preview_fps,
+    )
     window.show()
     sys.exit(app.exec())
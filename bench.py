@@ -0,0 +1,314 @@
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from core.face import FaceLandmarkDetector, NUM_LANDMARKS
+from core.roi import ROIExtractor
+from physiology import hrv
+from physiology.peaks import detect_peaks
+from physiology.spectral import SpectralHR
+from rppg.chrom import ChromRPPG
+from rppg.filters import bandpass
+from rppg.green import GreenRPPG
+from stress.index import StressScorer, compute_stress_index
+from ui.preview import render_preview
+
+
+FPS = 30
+SEED = 0
+
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+PERCENTILES = (50, 90, 99)
+
+
+# ---------------- SYNTHETIC INPUTS ---------------- #
+# Everything is generated from a fixed seed so two revisions are timed on
+# identical inputs; nothing touches a camera or a video file.
+
+
+def synthetic_frame(size, seed=SEED):
+    """Skin-toned (BGR) frame with mild noise, size = (width, height)."""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    frame = np.empty((h, w, 3), dtype=np.uint8)
+    frame[...] = (120, 150, 200)
+    noise = rng.integers(-8, 9, size=(h, w, 1), dtype=np.int16)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def synthetic_landmarks(size, seed=SEED):
+    """
+    NUM_LANDMARKS points scattered over a face-sized ellipse centred in
+    the frame, as int32 pixel coordinates like FaceLandmarkDetector.
+    """
+    w, h = size
+    rng = np.random.default_rng(seed)
+    angle = rng.uniform(0, 2 * np.pi, NUM_LANDMARKS)
+    radius = np.sqrt(rng.uniform(0, 1, NUM_LANDMARKS))
+
+    cx, cy = w / 2, h / 2
+    rx, ry = 0.15 * w, 0.3 * h
+    pts = np.stack([
+        cx + rx * radius * np.cos(angle),
+        cy + ry * radius * np.sin(angle),
+    ], axis=1)
+    return pts.astype(np.int32)
+
+
+def synthetic_pulse(hr_bpm, fps, seconds, noise=0.1, seed=SEED):
+    """Sinusoidal pulse at hr_bpm plus white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * fps)) / fps
+    pulse = np.sin(2 * np.pi * hr_bpm / 60.0 * t)
+    return pulse + noise * rng.standard_normal(len(t))
+
+
+def synthetic_rgb(hr_bpm, fps, seconds, seed=SEED):
+    """(N, 3) BGR skin means with the pulse riding on the green channel."""
+    pulse = synthetic_pulse(hr_bpm, fps, seconds, seed=seed)
+    base = np.array([120.0, 150.0, 200.0])
+    return base + np.outer(pulse, [0.2, 1.0, 0.5])
+
+
+def synthetic_rr(hr_bpm, n, jitter=0.03, seed=SEED):
+    """n RR intervals in seconds around 60 / hr_bpm."""
+    rng = np.random.default_rng(seed)
+    return 60.0 / hr_bpm + jitter * rng.standard_normal(n)
+
+
+# ---------------- MEASUREMENT ---------------- #
+
+
+def measure(fn, repeat=200, warmup=10):
+    """
+    Time `repeat` calls of fn() and report latency percentiles (in
+    microseconds), peak traced allocation and bytes retained per call.
+    Allocations come from a separate tracemalloc pass so tracing does
+    not skew the timings.
+    """
+    for _ in range(warmup):
+        fn()
+
+    clock = time.perf_counter_ns
+    times = np.empty(repeat)
+    for i in range(repeat):
+        t0 = clock()
+        fn()
+        times[i] = clock() - t0
+    times /= 1e3
+
+    alloc_calls = max(1, min(repeat, 20))
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    for _ in range(alloc_calls):
+        fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {f"p{q}_us": float(np.percentile(times, q)) for q in PERCENTILES}
+    result.update(
+        mean_us=float(times.mean()),
+        max_us=float(times.max()),
+        calls=repeat,
+        peak_alloc_kib=(peak - base) / 1024,
+        retained_kib=(current - base) / 1024 / alloc_calls,
+    )
+    return result
+
+
+# ---------------- STAGES ---------------- #
+# Each factory builds its stage and inputs once and returns the zero-arg
+# call to time, so only the steady-state per-call cost is measured.
+
+
+def _face_process(size):
+    # No real face in a synthetic frame, so this times FaceMesh's full
+    # detection pass (the worst case) rather than its tracking mode
+    face = FaceLandmarkDetector()
+    frame = synthetic_frame(size)
+    return lambda: face.process(frame)
+
+
+def _roi_extract(size):
+    roi = ROIExtractor()
+    frame, lm = synthetic_frame(size), synthetic_landmarks(size)
+    return lambda: roi.extract(frame, lm)
+
+
+def _roi_extract_stats(size):
+    roi = ROIExtractor()
+    frame, lm = synthetic_frame(size), synthetic_landmarks(size)
+    return lambda: roi.extract_stats(frame, lm)
+
+
+def _roi_extract_patches(size):
+    roi = ROIExtractor()
+    frame, lm = synthetic_frame(size), synthetic_landmarks(size)
+    return lambda: roi.extract_patches(frame, lm)
+
+
+def _render_preview(size):
+    frame, lm = synthetic_frame(size), synthetic_landmarks(size)
+    roi = ROIExtractor().extract_stats(frame, lm)
+    return lambda: render_preview(frame, (720, 540), roi.bbox, roi)
+
+
+def _rppg_update(cls):
+    def factory():
+        rppg = cls(FPS)
+        rgb = synthetic_rgb(72, FPS, 20)
+        for sample in rgb[:300]:
+            rppg.update(sample[None].repeat(64, axis=0))
+
+        samples = iter(np.tile(rgb, (1000, 1)))
+        return lambda: rppg.update(next(samples)[None].repeat(64, axis=0))
+    return factory
+
+
+def _bandpass():
+    signal = synthetic_pulse(72, FPS, 10)
+    return lambda: bandpass(signal, FPS)
+
+
+def _detect_peaks():
+    signal = synthetic_pulse(72, FPS, 30)
+    return lambda: detect_peaks(signal, FPS)
+
+
+def _spectral_update():
+    spectral = SpectralHR(FPS)
+    spectral.update(synthetic_pulse(72, FPS, 10))
+    samples = iter(np.tile(synthetic_pulse(72, FPS, 10), 1000))
+    return lambda: spectral.update(next(samples))
+
+
+def _spectral_estimate():
+    spectral = SpectralHR(FPS)
+    spectral.update(synthetic_pulse(72, FPS, 10))
+    return spectral.estimate
+
+
+def _hrv(fn):
+    def factory():
+        # 64 beats -> 256 samples at 4 Hz, one full default Welch segment
+        rr = synthetic_rr(72, 64)
+        return lambda: fn(rr)
+    return factory
+
+
+def _stress():
+    hr = list(72 + synthetic_pulse(0.5, 1, 60))
+    return lambda: compute_stress_index(hr[-1], 40.0, hr)
+
+
+def _stress_scorer():
+    scorer = StressScorer()
+    hr = iter(np.tile(72 + synthetic_pulse(0.5, 1, 60), 10000))
+    return lambda: scorer.update(next(hr), 40.0)
+
+
+def build_benchmarks():
+    """name -> factory(); frame stages get one entry per resolution."""
+    benches = {}
+    for res, size in RESOLUTIONS.items():
+        benches[f"face.process[{res}]"] = lambda s=size: _face_process(s)
+        benches[f"roi.extract[{res}]"] = lambda s=size: _roi_extract(s)
+        benches[f"roi.extract_stats[{res}]"] = (
+            lambda s=size: _roi_extract_stats(s)
+        )
+        benches[f"roi.extract_patches[{res}]"] = (
+            lambda s=size: _roi_extract_patches(s)
+        )
+        benches[f"ui.render_preview[{res}]"] = (
+            lambda s=size: _render_preview(s)
+        )
+
+    benches["green.update"] = _rppg_update(GreenRPPG)
+    benches["chrom.update"] = _rppg_update(ChromRPPG)
+    benches["filters.bandpass"] = _bandpass
+    benches["peaks.detect_peaks"] = _detect_peaks
+    benches["spectral.update"] = _spectral_update
+    benches["spectral.estimate"] = _spectral_estimate
+    for name in ("compute_hr", "rmssd", "sdnn", "lf_hf"):
+        benches[f"hrv.{name}"] = _hrv(getattr(hrv, name))
+    benches["stress.compute_stress_index"] = _stress
+    benches["stress.StressScorer.update"] = _stress_scorer
+    return benches
+
+
+def run(names=None, repeat=200):
+    benches = build_benchmarks()
+    results = {}
+    for name, factory in benches.items():
+        if names and not any(n in name for n in names):
+            continue
+        results[name] = measure(factory(), repeat=repeat)
+        print(_format_row(name, results[name]))
+    return results
+
+
+def compare(baseline, current, key="p50_us"):
+    """current / baseline latency ratio for every benchmark in both runs."""
+    return {
+        name: current[name][key] / baseline[name][key]
+        for name in current
+        if name in baseline and baseline[name][key] > 0
+    }
+
+
+def _format_row(name, r):
+    return (f"{name:<32} p50 {r['p50_us']:>10.1f} us  "
+            f"p90 {r['p90_us']:>10.1f}  p99 {r['p99_us']:>10.1f}  "
+            f"alloc {r['peak_alloc_kib']:>9.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-stage latency / allocation benchmarks on "
+                    "synthetic inputs (no camera or video needed)"
+    )
+    parser.add_argument("names", nargs="*",
+                        help="only run benchmarks containing these strings")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--out", default=None,
+                        help="write results as JSON for later --compare")
+    parser.add_argument("--compare", default=None,
+                        help="baseline JSON from an earlier --out")
+    args = parser.parse_args()
+
+    results = run(args.names, args.repeat)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "opencv": cv2.__version__,
+                    "machine": platform.machine(),
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\nWrote {len(results)} benchmarks to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print("\n=== p50 vs baseline ===")
+        for name, ratio in compare(baseline, results).items():
+            print(f"{name:<32} {ratio:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,48 +2,239 @@ import cv2
 import numpy as np
 import mediapipe as mp
 
+from core.landmarks import (
+    LANDMARK_REGIONS, NUM_LANDMARKS, TRACK_POINTS, landmark_subset
+)
+
+
 class FaceLandmarkDetector:
-    def __init__(self):
+    def __init__(self, detect_interval=1, tracker="flow",
+                 min_track_quality=0.7, motion_threshold=0.02,
+                 regions=None, static_image_mode=False, max_faces=1,
+                 min_face_size=160, max_downscale=4):
         self.mp_face = mp.solutions.face_mesh
         self.prev_landmarks = None
         self.alpha = 0.7
 
         self.detector = self.mp_face.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=1,
+            static_image_mode=static_image_mode,
+            max_num_faces=max_faces,
             refine_landmarks=False,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
 
+        # -------- TRACKING BETWEEN DETECTIONS -------- #
+        # detect_interval=1 runs FaceMesh on every frame (no tracking).
+        # Otherwise FaceMesh runs at most every detect_interval frames;
+        # the interval shrinks when motion (median landmark displacement
+        # relative to face size) exceeds motion_threshold.
+        if tracker not in ("flow", "velocity"):
+            raise ValueError("Unknown landmark tracker")
+
+        self.detect_interval = max(1, detect_interval)
+        self.tracker = tracker
+        self.min_track_quality = min_track_quality
+        self.motion_threshold = motion_threshold
+
+        self.interval = self.detect_interval
+        self.detected = False
+        self.tracked = False
+        self.track_quality = None
+        self.motion = 0.0
+
+        self._raw = None
+        self._velocity = None
+        self._prev_gray = None
+        self._since_detect = 0
+
+        # -------- LANDMARK SUBSET -------- #
+        # regions=None returns the full mesh. Otherwise only the union of
+        # the named LANDMARK_REGIONS is converted, smoothed and returned;
+        # self.regions maps each name to rows of the returned array.
+        self.indices, self.regions = landmark_subset(regions)
+        if self.indices is None:
+            track_ids = TRACK_POINTS
+        else:
+            track_ids = [self.indices.index(i) for i in TRACK_POINTS
+                         if i in self.indices]
+            if len(track_ids) < 6:
+                track_ids = range(len(self.indices))
+        self.track_ids = np.array(track_ids)
+
+        n = NUM_LANDMARKS if self.indices is None else len(self.indices)
+        self._points = np.empty((n, 2), dtype=np.float32)
+
+        # -------- DOWNSCALED DETECTION -------- #
+        # FaceMesh crops the face to 192 px anyway, so once a face has
+        # been seen the frame is shrunk by an integer factor that keeps
+        # it at least min_face_size px wide (at most max_downscale).
+        # Landmarks are normalised, so they map straight back to full
+        # resolution. Until a face is found, detection runs at full size.
+        self.min_face_size = min_face_size
+        self.max_downscale = max(1, max_downscale)
+        self.downscale = 1
+
     def process(self, frame):
+        tracking = self.detect_interval > 1
+
+        gray = None
+        if tracking and self.tracker == "flow":
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        landmarks = None
+        self.detected = False
+        self.tracked = False
+
+        if (tracking and self._raw is not None
+                and self._since_detect + 1 < self.interval):
+            landmarks = self._track(gray)
+            self.tracked = landmarks is not None
+
+        if landmarks is None:
+            landmarks = self._detect(frame)
+            self.detected = landmarks is not None
+
+        self._prev_gray = gray
+
+        if landmarks is None:
+            self._raw = None
+            self._velocity = None
+            return None, None
+
+        if tracking and self._raw is not None:
+            self._velocity = landmarks - self._raw
+            self._adapt_interval(landmarks)
+        # Detected points live in the reused self._points buffer, which
+        # the next detection overwrites; keep a snapshot
+        self._raw = landmarks.copy() if self.detected else landmarks
+
+        x1, y1 = landmarks.min(axis=0).astype(int)
+        x2, y2 = landmarks.max(axis=0).astype(int)
+
+        if self.prev_landmarks is None:
+            self.prev_landmarks = landmarks.copy()
+        else:
+            # In-place EMA: prev = alpha * prev + (1 - alpha) * landmarks
+            self.prev_landmarks *= self.alpha
+            self.prev_landmarks += (1 - self.alpha) * landmarks
+
+        return self.prev_landmarks.astype(np.int32), (x1, y1, x2, y2)
+
+    def detect_all(self, frame):
+        """
+        Stateless detection of up to max_faces faces: no tracking and no
+        smoothing, so one detector can serve frames from many streams.
+        Returns a list of (int32 landmarks, (x1, y1, x2, y2)).
+        """
         h, w, _ = frame.shape
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         result = self.detector.process(rgb)
 
+        faces = []
+        for face in result.multi_face_landmarks or []:
+            points = self._to_pixels(
+                face.landmark, w, h, np.empty_like(self._points)
+            ).astype(np.int32)
+            x1, y1 = points.min(axis=0)
+            x2, y2 = points.max(axis=0)
+            faces.append((points, (int(x1), int(y1), int(x2), int(y2))))
+        return faces
+
+    def _detect(self, frame):
+        h, w, _ = frame.shape
+        small = frame
+        d = self.downscale
+        if d > 1:
+            small = cv2.resize(
+                frame, (w // d, h // d), interpolation=cv2.INTER_AREA
+            )
+        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        result = self.detector.process(rgb)
+
+        self._since_detect = 0
+
         if not result.multi_face_landmarks:
-            return None, None
+            self.downscale = 1
+            return None
 
-        face_landmarks = result.multi_face_landmarks[0]
-        points = []
+        mesh = result.multi_face_landmarks[0].landmark
+        points = self._to_pixels(mesh, w, h, self._points)
 
-        for lm in face_landmarks.landmark:
-            x = int(lm.x * w)
-            y = int(lm.y * h)
-            points.append((x, y))
+        if self.min_face_size:
+            face_w = points[:, 0].max() - points[:, 0].min()
+            self.downscale = int(np.clip(
+                face_w // self.min_face_size, 1, self.max_downscale
+            ))
+        return points
 
-        landmarks = np.array(points)
+    def _to_pixels(self, mesh, w, h, out):
+        if self.indices is not None:
+            mesh = [mesh[i] for i in self.indices]
 
-        x1, y1 = landmarks.min(axis=0)
-        x2, y2 = landmarks.max(axis=0)
+        out.reshape(-1)[:] = np.fromiter(
+            (c for lm in mesh for c in (lm.x, lm.y)),
+            dtype=np.float32, count=out.size
+        )
+        out *= (w, h)
+        # Truncate toward zero like int(), for parity with the pixel grid
+        np.trunc(out, out=out)
+        return out
 
-        if self.prev_landmarks is None:
-            smooth_landmarks = landmarks
+    def _track(self, gray):
+        if self.tracker == "velocity":
+            landmarks = self._raw
+            if self._velocity is not None:
+                landmarks = self._raw + self._velocity
+            self.track_quality = None
         else:
-            smooth_landmarks = (
-                self.alpha * self.prev_landmarks +
-                (1 - self.alpha) * landmarks
-            )
+            landmarks = self._track_flow(gray)
+            if landmarks is None:
+                return None
+
+        self._since_detect += 1
+        return landmarks
+
+    def _track_flow(self, gray):
+        if self._prev_gray is None:
+            return None
+
+        prev_pts = self._raw[self.track_ids].reshape(-1, 1, 2)
+        next_pts, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, prev_pts, None,
+            winSize=(15, 15), maxLevel=2
+        )
+
+        good = status.ravel() == 1
+        if good.sum() < 6:
+            self.track_quality = 0.0
+            return None
+
+        transform, inliers = cv2.estimateAffinePartial2D(
+            prev_pts[good], next_pts[good], method=cv2.RANSAC,
+            ransacReprojThreshold=2.0
+        )
+        if transform is None:
+            self.track_quality = 0.0
+            return None
+
+        self.track_quality = inliers.sum() / len(self.track_ids)
+        if self.track_quality < self.min_track_quality:
+            return None
+
+        transform = transform.astype(np.float32)
+        return self._raw @ transform[:, :2].T + transform[:, 2]
+
+    def _adapt_interval(self, landmarks):
+        x1, y1 = self._raw.min(axis=0)
+        x2, y2 = self._raw.max(axis=0)
+        face_size = max(np.hypot(x2 - x1, y2 - y1), 1.0)
+
+        self.motion = np.median(
+            np.linalg.norm(landmarks - self._raw, axis=1)
+        ) / face_size
 
-        self.prev_landmarks = smooth_landmarks
-        return smooth_landmarks.astype(int), (x1, y1, x2, y2)
+        if self.motion > self.motion_threshold:
+            self.interval = max(1, self.interval // 2)
+        elif self.motion < 0.25 * self.motion_threshold:
+            self.interval = min(self.detect_interval, self.interval + 1)
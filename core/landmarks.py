@@ -0,0 +1,58 @@
+import numpy as np
+
+# MediaPipe 468-point mesh indices; left/right as seen in the image.
+LANDMARK_REGIONS = {
+    "face_oval": [
+        10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
+        397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
+        172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109,
+    ],
+    "forehead": [
+        10, 338, 297, 332, 109, 67, 103, 151, 9, 108, 69, 104, 337,
+        299, 333,
+    ],
+    "left_cheek": [50, 101, 118, 117, 123, 147, 187, 205, 36, 142, 116],
+    "right_cheek": [280, 330, 347, 346, 352, 376, 411, 425, 266, 371, 345],
+    "left_eye": [
+        33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159,
+        160, 161, 246,
+    ],
+    "right_eye": [
+        362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386,
+        385, 384, 398,
+    ],
+    "mouth": [
+        61, 146, 91, 181, 84, 17, 314, 405, 321, 375, 291, 409, 270,
+        269, 267, 0, 37, 39, 40, 185,
+    ],
+}
+
+NUM_LANDMARKS = 468
+
+# Face oval plus rigid interior points (nose bridge, forehead, cheekbones):
+# enough texture for sparse flow and enough spread to fit a similarity.
+TRACK_POINTS = [
+    10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
+    397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
+    172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109,
+    6, 197, 195, 5, 4, 151, 9, 50, 280, 123, 352,
+]
+
+
+def landmark_subset(regions=None):
+    """
+    Returns (indices, rows) for a list of LANDMARK_REGIONS names: the
+    sorted mesh indices kept (None for the full mesh) and, per region,
+    its rows in the landmark array FaceLandmarkDetector returns.
+    """
+    if regions is None:
+        return None, {
+            name: np.array(ids) for name, ids in LANDMARK_REGIONS.items()
+        }
+
+    indices = sorted({i for name in regions for i in LANDMARK_REGIONS[name]})
+    rows = {
+        name: np.searchsorted(indices, LANDMARK_REGIONS[name])
+        for name in regions
+    }
+    return indices, rows
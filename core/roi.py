@@ -1,10 +1,85 @@
+from collections import OrderedDict, namedtuple
+
 import cv2
 import numpy as np
 
+from core.landmarks import LANDMARK_REGIONS
+
+
+# Forehead / cheek rectangles as fractions (x1, y1, x2, y2) of the face bbox
+REGION_NAMES = ("forehead", "left_cheek", "right_cheek")
+REGION_BOXES = (
+    (0.25, 0.05, 0.75, 0.30),
+    (0.10, 0.45, 0.35, 0.75),
+    (0.65, 0.45, 0.90, 0.75),
+)
+
+# Landmark regions cut out of the ROI rectangles
+EXCLUDE_REGIONS = ("left_eye", "right_eye", "mouth")
+
+# mean is (B, G, R) over skin pixels; mask is local to bbox (x1, y1, x2, y2)
+ROIStats = namedtuple("ROIStats", ["mean", "count", "bbox", "mask"])
+
+# Patch grid over the face bbox: mean is (patches, 3) (B, G, R), count is
+# (patches,) skin pixels, patches in row-major order of grid (rows, cols)
+PatchStats = namedtuple("PatchStats", ["mean", "count", "bbox", "grid"])
+
+
+def channel_means(roi, min_pixels=50):
+    """
+    (B, G, R) means from either an ROIStats record or an N x 3 pixel array.
+    Returns None when the ROI holds fewer than min_pixels skin pixels.
+    """
+    if roi is None:
+        return None
+
+    if isinstance(roi, ROIStats):
+        if roi.count < min_pixels:
+            return None
+        return roi.mean
+
+    if len(roi) < min_pixels:
+        return None
+    return roi.mean(axis=0)
+
+
+def combine_regions(regions):
+    """
+    Merge extract_region_stats() output into the single ROIStats that
+    extract_stats() returns (count-weighted mean, no mask).
+    """
+    count = sum(r.count for r in regions)
+    bbox = regions[0].bbox
+    if count == 0:
+        return ROIStats(np.zeros(3), 0, bbox, None)
+    mean = sum(r.mean * r.count for r in regions) / count
+    return ROIStats(mean, count, bbox, None)
+
 
 class ROIExtractor:
-    def __init__(self):
-        pass
+    """
+    regions maps landmark region names to rows of the landmark array,
+    as FaceLandmarkDetector.regions does; the default is the full mesh.
+    Regions in EXCLUDE_REGIONS that are missing from it are not cut out.
+
+    The geometric part of the mask (rectangles minus eyes and mouth) is
+    cached per face bbox quantised to mask_quantum pixels, keeping the
+    cache_size most recent templates. While a face stays inside one
+    quantum its first template, and the crop it was drawn for, are
+    reused; only the skin test runs per frame. mask_quantum=0 redraws
+    every frame. An instance is not thread-safe.
+    """
+
+    def __init__(self, regions=None, mask_quantum=4, cache_size=8):
+        if regions is None:
+            regions = LANDMARK_REGIONS
+        self.exclude = [
+            np.asarray(regions[name]) for name in EXCLUDE_REGIONS
+            if name in regions
+        ]
+        self.mask_quantum = mask_quantum
+        self.cache_size = cache_size
+        self._templates = OrderedDict()
 
     def extract(self, frame, landmarks):
         """
@@ -81,14 +156,7 @@ class ROIExtractor:
         # ---------------------------
         # 4️⃣ REMOVE EYES & MOUTH (LANDMARK MASKING)
         # ---------------------------
-        # Eyes
-        for eye_ids in [range(36, 42), range(42, 48)]:
-            eye_pts = lm[list(eye_ids)]
-            cv2.fillConvexPoly(mask, eye_pts, 0)
-
-        # Mouth
-        mouth_pts = lm[48:68]
-        cv2.fillConvexPoly(mask, mouth_pts, 0)
+        self._cut_exclusions(mask, lm)
 
         # ---------------------------
         # 5️⃣ SKIN MASK (YCrCb)
@@ -104,3 +172,171 @@ class ROIExtractor:
         roi_pixels = frame[final_mask == 255]
 
         return roi_pixels, final_mask
+
+    def extract_stats(self, frame, landmarks):
+        """
+        Fast path of extract(): masks only the landmark bounding box and
+        returns channel statistics instead of copying the skin pixels.
+        """
+        crop, bbox, mask = self._crop_mask(frame, landmarks, (255, 255, 255))
+        if crop is None:
+            return ROIStats(np.zeros(3), 0, bbox, None)
+
+        count = cv2.countNonZero(mask)
+        if count == 0:
+            return ROIStats(np.zeros(3), 0, bbox, mask)
+
+        mean = np.array(cv2.mean(crop, mask=mask)[:3])
+        return ROIStats(mean, count, bbox, mask)
+
+    def extract_region_stats(self, frame, landmarks):
+        """
+        Like extract_stats(), but one ROIStats per entry of REGION_NAMES.
+        Region masks are not kept (mask is None).
+        """
+        crop, bbox, labels = self._crop_mask(frame, landmarks, (1, 2, 3))
+
+        stats = []
+        for label in (1, 2, 3):
+            if crop is None:
+                stats.append(ROIStats(np.zeros(3), 0, bbox, None))
+                continue
+
+            region = (labels == label).view(np.uint8)
+            count = cv2.countNonZero(region)
+            mean = np.zeros(3)
+            if count:
+                mean = np.array(cv2.mean(crop, mask=region)[:3])
+            stats.append(ROIStats(mean, count, bbox, None))
+        return stats
+
+    def extract_patches(self, frame, landmarks, grid=(8, 8)):
+        """
+        Split the landmark bbox into a rows x cols grid and return every
+        patch's skin-pixel mean and count as PatchStats. Eyes and mouth
+        are masked out as in extract(). One integral image per channel
+        (plus one of the mask) gives each patch's sums in O(1), so the
+        cost is independent of the number of patches.
+        """
+        rows, cols = grid
+        h, w, _ = frame.shape
+        lm = np.array(landmarks, dtype=np.int32)
+
+        x_min, y_min = lm.min(axis=0)
+        x_max, y_max = lm.max(axis=0)
+        cx1, cy1 = max(x_min, 0), max(y_min, 0)
+        cx2, cy2 = min(x_max + 1, w), min(y_max + 1, h)
+        bbox = (int(cx1), int(cy1), int(cx2), int(cy2))
+
+        mean = np.zeros((rows * cols, 3))
+        count = np.zeros(rows * cols, dtype=np.int64)
+        if cx2 - cx1 < cols or cy2 - cy1 < rows:
+            return PatchStats(mean, count, bbox, grid)
+
+        crop = frame[cy1:cy2, cx1:cx2]
+        ycrcb = cv2.cvtColor(crop, cv2.COLOR_BGR2YCrCb)
+        skin = cv2.inRange(ycrcb, (0, 133, 77), (255, 173, 127))
+        self._cut_exclusions(skin, lm - (cx1, cy1))
+
+        sums = cv2.integral(cv2.bitwise_and(crop, crop, mask=skin))
+        counts = cv2.integral(skin // 255)
+
+        # Patch corners on the (h + 1, w + 1) integral grid
+        ys = np.linspace(0, cy2 - cy1, rows + 1).astype(int)
+        xs = np.linspace(0, cx2 - cx1, cols + 1).astype(int)
+        y1, y2 = ys[:-1, None], ys[1:, None]
+        x1, x2 = xs[None, :-1], xs[None, 1:]
+
+        def box(table):
+            return (table[y2, x2] - table[y1, x2]
+                    - table[y2, x1] + table[y1, x1])
+
+        count[:] = box(counts).reshape(-1)
+        total = box(sums).reshape(-1, 3)
+        ok = count > 0
+        mean[ok] = total[ok] / count[ok, None]
+        return PatchStats(mean, count, bbox, grid)
+
+    def _crop_mask(self, frame, landmarks, values):
+        """
+        Crop to the landmark bbox and mask the forehead / cheek rectangles
+        with the given mask values, minus eyes, mouth and non-skin pixels;
+        the geometric part comes from the template cache when possible.
+        Returns (crop, bbox, mask); crop is None when the bbox lies
+        outside the frame.
+        """
+        h, w, _ = frame.shape
+        lm = np.array(landmarks, dtype=np.int32)
+
+        x_min, y_min = lm.min(axis=0)
+        x_max, y_max = lm.max(axis=0)
+
+        key = None
+        template = None
+        if self.mask_quantum:
+            q = self.mask_quantum
+            key = (h, w, x_min // q, y_min // q, x_max // q, y_max // q,
+                   values)
+            template = self._templates.get(key)
+
+        if template is not None:
+            self._templates.move_to_end(key)
+            bbox, geometry = template
+        else:
+            bbox, geometry = self._geometry(lm, h, w, values)
+            if key is not None:
+                self._templates[key] = (bbox, geometry)
+                if len(self._templates) > self.cache_size:
+                    self._templates.popitem(last=False)
+
+        if geometry is None:
+            return None, bbox, None
+
+        cx1, cy1, cx2, cy2 = bbox
+        crop = frame[cy1:cy2, cx1:cx2]
+        ycrcb = cv2.cvtColor(crop, cv2.COLOR_BGR2YCrCb)
+        skin = cv2.inRange(ycrcb, (0, 133, 77), (255, 173, 127))
+        return crop, bbox, cv2.bitwise_and(geometry, skin)
+
+    def _geometry(self, lm, h, w, values):
+        """
+        Crop bbox and crop-local mask of the forehead / cheek rectangles
+        (with the given values) minus eyes and mouth. The mask is None
+        when the bbox lies outside the frame.
+        """
+        x_min, y_min = lm.min(axis=0)
+        x_max, y_max = lm.max(axis=0)
+
+        # Crop in frame coordinates (rectangles are inclusive of x_max/y_max)
+        cx1, cy1 = max(x_min, 0), max(y_min, 0)
+        cx2, cy2 = min(x_max + 1, w), min(y_max + 1, h)
+        bbox = (int(cx1), int(cy1), int(cx2), int(cy2))
+
+        if cx2 <= cx1 or cy2 <= cy1:
+            return bbox, None
+
+        mask = np.zeros((cy2 - cy1, cx2 - cx1), dtype=np.uint8)
+
+        # Shift geometry into crop coordinates
+        lm_local = lm - (cx1, cy1)
+        x_min, x_max = x_min - cx1, x_max - cx1
+        y_min, y_max = y_min - cy1, y_max - cy1
+
+        face_w = x_max - x_min
+        face_h = y_max - y_min
+
+        for (fx1, fy1, fx2, fy2), value in zip(REGION_BOXES, values):
+            cv2.rectangle(
+                mask,
+                (int(x_min + fx1 * face_w), int(y_min + fy1 * face_h)),
+                (int(x_min + fx2 * face_w), int(y_min + fy2 * face_h)),
+                value,
+                -1
+            )
+
+        self._cut_exclusions(mask, lm_local)
+        return bbox, mask
+
+    def _cut_exclusions(self, mask, lm):
+        if self.exclude:
+            cv2.fillPoly(mask, [lm[ids] for ids in self.exclude], 0)
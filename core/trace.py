@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from core.face import FaceLandmarkDetector
+from core.roi import REGION_BOXES, REGION_NAMES, ROIExtractor, ROIStats
+from core.video_source import VideoSource
+
+
+# Bump when extraction changes in a way that invalidates cached traces
+TRACE_VERSION = 3
+
+N_REGIONS = len(REGION_NAMES)
+
+# One record per decoded frame. rgb holds per-region (B, G, R) means.
+TRACE_DTYPE = np.dtype([
+    ("t", np.float64),
+    ("rgb", np.float32, (N_REGIONS, 3)),
+    ("count", np.int32, (N_REGIONS,)),
+    ("found", np.bool_),
+])
+
+
+def extract_trace(video_path, detector_kwargs=None, timings=None):
+    """
+    Decode a video once and record, per frame, its pts (the time base
+    live streams use too) and each ROI region's skin-pixel mean and
+    count. If a `timings` dict is given, decode / landmarks / roi
+    seconds are accumulated into it.
+    """
+    vs = VideoSource(video_path)
+    vs.open()
+
+    face = FaceLandmarkDetector(**(detector_kwargs or {}))
+    roi = ROIExtractor(regions=face.regions)
+
+    if timings is None:
+        timings = {}
+    for stage in ("decode", "landmarks", "roi"):
+        timings.setdefault(stage, 0.0)
+
+    records = []
+    clock = time.perf_counter
+
+    while True:
+        t0 = clock()
+        packet = vs.read_packet()
+        t1 = clock()
+        timings["decode"] += t1 - t0
+        if packet is None:
+            break
+        frame = packet.frame
+
+        rec = np.zeros((), dtype=TRACE_DTYPE)
+        rec["t"] = packet.pts
+
+        landmarks, _ = face.process(frame)
+        t2 = clock()
+        timings["landmarks"] += t2 - t1
+
+        if landmarks is not None:
+            rec["found"] = True
+            regions = roi.extract_region_stats(frame, landmarks)
+            for i, stats in enumerate(regions):
+                rec["rgb"][i] = stats.mean
+                rec["count"][i] = stats.count
+            timings["roi"] += clock() - t2
+
+        records.append(rec)
+
+    vs.release()
+    return np.array(records, dtype=TRACE_DTYPE)
+
+
+def frame_stats(record):
+    """
+    Combine one trace record's regions into a single ROIStats, as
+    ROIExtractor.extract_stats() would have returned for that frame.
+    Returns None for frames without a face.
+    """
+    if not record["found"]:
+        return None
+
+    count = int(record["count"].sum())
+    if count == 0:
+        return ROIStats(np.zeros(3), 0, None, None)
+
+    weights = record["count"].astype(np.float64)
+    mean = (record["rgb"] * weights[:, None]).sum(axis=0) / count
+    return ROIStats(mean, count, None, None)
+
+
+def trace_rgb(trace, min_pixels=50):
+    """
+    Vectorized frame_stats() over a whole trace: the (N, 3) (B, G, R)
+    skin means of the frames channel_means() would accept, plus their
+    timestamps.
+    """
+    count = trace["count"].sum(axis=1)
+    keep = trace["found"] & (count >= min_pixels)
+
+    weights = trace["count"][keep].astype(np.float64)
+    total = weights.sum(axis=1, keepdims=True)
+    rgb = (trace["rgb"][keep] * weights[..., None]).sum(axis=1) / total
+    return rgb, trace["t"][keep]
+
+
+class TraceCache:
+    """
+    Size-bounded on-disk cache of ROI traces. Entries are .npy files
+    (loaded memory-mapped) keyed by the video's content hash plus the
+    detector / ROI settings. Least recently used entries are evicted
+    once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, root, max_bytes=2 * 1024 ** 3):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+        # path -> (size, mtime_ns, sha1) so unchanged videos hash once
+        self._index_path = os.path.join(root, "hashes.json")
+        self._hashes = {}
+        try:
+            with open(self._index_path) as f:
+                self._hashes = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def key(self, video_path, detector_kwargs=None):
+        settings = json.dumps({
+            "version": TRACE_VERSION,
+            "regions": REGION_BOXES,
+            "detector": detector_kwargs or {},
+        }, sort_keys=True)
+        digest = hashlib.sha1(self._content_hash(video_path).encode())
+        digest.update(settings.encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        path = self._entry(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)    # mtime is the LRU clock
+        return np.load(path, mmap_mode="r")
+
+    def put(self, key, trace):
+        path = self._entry(key)
+        tmp = f"{path[:-4]}.{os.getpid()}.tmp.npy"
+        np.save(tmp, trace)
+        os.replace(tmp, path)
+        self._evict(keep=path)
+
+    def load(self, video_path, detector_kwargs=None, timings=None):
+        """
+        Return the cached trace for this video and settings, extracting
+        and storing it first on a miss.
+        """
+        key = self.key(video_path, detector_kwargs)
+        trace = self.get(key)
+        if trace is None:
+            self.put(key, extract_trace(video_path, detector_kwargs, timings))
+            trace = self.get(key)
+        return trace
+
+    def _entry(self, key):
+        return os.path.join(self.root, f"{key}.npy")
+
+    def _content_hash(self, video_path):
+        st = os.stat(video_path)
+        path = os.path.abspath(video_path)
+        known = self._hashes.get(path)
+        if known and known[:2] == [st.st_size, st.st_mtime_ns]:
+            return known[2]
+
+        h = hashlib.sha1()
+        with open(video_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+
+        self._hashes[path] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        # Several eval workers may share the cache: replace atomically
+        tmp = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._hashes, f)
+        os.replace(tmp, self._index_path)
+        return h.hexdigest()
+
+    def _evict(self, keep=None):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".npy") and ".tmp" not in name:
+                path = os.path.join(self.root, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
@@ -1,23 +1,149 @@
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
 import cv2
 
+
+DEFAULT_FPS = 30.0
+
+# timestamp is the monotonic capture time; pts is stream time in seconds
+# from the first frame: media time for files, capture time for live
+# sources. Signal processing runs on pts.
+FramePacket = namedtuple("FramePacket", ["frame", "timestamp", "seq", "pts"])
+
+
 class VideoSource:
-    def __init__(self, source=0):
+    def __init__(self, source=0, threaded=False, buffer_size=2):
         self.source = source
         self.cap = None
+        self._fps = DEFAULT_FPS
+        self.live = not (isinstance(source, str) and os.path.exists(source))
+
+        # -------- BACKGROUND CAPTURE -------- #
+        self.threaded = threaded
+        self.buffer_size = max(1, buffer_size)
+        self.dropped = 0
+        self._seq = 0
+        self._ring = deque()
+        self._t_open = None
+        self._last_pts = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._eof = False
 
     def open(self):
         self.cap = cv2.VideoCapture(self.source)
         if not self.cap.isOpened():
             raise RuntimeError("Unable to open video source")
+        self._fps = self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+
+        self._seq = 0
+        self.dropped = 0
+        self._ring.clear()
+        self._eof = False
+        self._t_open = None
+        self._last_pts = None
+
+        if self.threaded:
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._capture_loop, name="VideoSource", daemon=True
+            )
+            self._thread.start()
 
     def read(self):
+        packet = self.read_packet()
+        if packet is None:
+            return None
+        return packet.frame
+
+    def read_packet(self, timeout=None):
+        """
+        Return the next FramePacket, or None at end of stream.
+        In threaded mode the newest buffered frame wins and any
+        older frames still waiting are counted as dropped.
+        """
         if self.cap is None:
             raise RuntimeError("Video source not opened")
+
+        if not self.threaded:
+            return self._grab()
+
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._ring or self._eof, timeout=timeout
+            ):
+                return None
+            if not self._ring:
+                return None
+
+            packet = self._ring.pop()
+            self.dropped += len(self._ring)
+            self._ring.clear()
+            return packet
+
+    @property
+    def fps(self):
+        """Nominal frame rate reported by the source, else DEFAULT_FPS."""
+        return self._fps
+
+    @property
+    def exhausted(self):
+        """True once the stream has ended and every frame has been read."""
+        with self._cond:
+            return self._eof and not self._ring
+
+    def _grab(self):
         ret, frame = self.cap.read()
+        now = time.monotonic()
         if not ret:
+            self._eof = True
             return None
-        return frame
+
+        if self.live:
+            if self._t_open is None:
+                self._t_open = now
+            pts = now - self._t_open
+        else:
+            pts = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            # Containers without usable timestamps: nominal frame clock
+            if self._last_pts is not None and pts <= self._last_pts:
+                pts = self._seq / self.fps
+        self._last_pts = pts
+
+        packet = FramePacket(frame, now, self._seq, pts)
+        self._seq += 1
+        return packet
+
+    def _capture_loop(self):
+        while self._running:
+            packet = self._grab()
+
+            with self._cond:
+                if packet is None:
+                    self._eof = True
+                    self._cond.notify_all()
+                    return
+
+                if len(self._ring) >= self.buffer_size:
+                    self._ring.popleft()
+                    self.dropped += 1
+                self._ring.append(packet)
+                self._cond.notify_all()
 
     def release(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        with self._cond:
+            self._eof = True
+            self._ring.clear()
+            self._cond.notify_all()
+
         if self.cap:
             self.cap.release()
@@ -1,24 +1,25 @@
+import time
+
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.signal import butter, filtfilt, find_peaks, resample
 from sklearn.metrics import mean_absolute_error
 
-from core.video_source import VideoSource
-from core.face import FaceLandmarkDetector
-from core.roi import ROIExtractor
-from rppg.green import GreenRPPG
-from rppg.chrom import ChromRPPG
+from core.trace import extract_trace, trace_rgb
+from core.video_source import DEFAULT_FPS
+from rppg import registry
+from rppg.resample import resample as resample_uniform
 
 
 VIDEO_PATH = "/Users/shrish/Desktop/stress_detector/eval_data/vid.avi"
 PPG_PATH = "/Users/shrish/Desktop/stress_detector/eval_data/ground_truth.txt"
 
-FPS_RPPG = 30    
-FS_PPG = 64    
+FS_PPG = 64
 LOW_HZ = 0.7
 HIGH_HZ = 3.0
 
+STAGES = ("decode", "landmarks", "roi", "rppg")
+
 
 def bandpass(sig, fs, low=0.7, high=3.0, order=3):
     if len(sig) < fs * 2:
@@ -27,39 +28,46 @@ def bandpass(sig, fs, low=0.7, high=3.0, order=3):
     return filtfilt(b, a, sig)
 
 
-def extract_rppg(video_path, method="green"):
-    vs = VideoSource(video_path)
-    vs.open()
-
-    face = FaceLandmarkDetector()
-    roi = ROIExtractor()
-
-    if method == "green":
-        rppg = GreenRPPG(FPS_RPPG)
-    elif method == "chrom":
-        rppg = ChromRPPG(FPS_RPPG)
+def extract_rppg(video_path, method="green", timings=None, cache=None,
+                 fs=None):
+    """
+    Run the video through the ROI + rPPG pipeline and return the rPPG
+    signal on a uniform fs grid (see rppg_from_trace). If a `timings`
+    dict is given, per-stage wall-clock seconds are accumulated into it.
+    With a TraceCache, the ROI trace is only extracted on the first run.
+    """
+    if timings is None:
+        timings = {}
+    for stage in STAGES:
+        timings.setdefault(stage, 0.0)
+
+    if cache is not None:
+        trace = cache.load(video_path, timings=timings)
     else:
-        raise ValueError("Unknown rPPG method")
-
-    signal = []
+        trace = extract_trace(video_path, timings=timings)
 
-    while True:
-        frame = vs.read()
-        if frame is None:
-            break
+    return rppg_from_trace(trace, method, timings, fs)
 
-        landmarks, _ = face.process(frame)
-        if landmarks is None:
-            continue
 
-        roi_pixels, _ = roi.extract(frame, landmarks)
-        s = rppg.update(roi_pixels)
+def rppg_from_trace(trace, method="green", timings=None, fs=None):
+    """
+    Score a ROI trace with any registered rPPG method in one vectorized
+    pass (no per-frame loop). Frames without a usable face are dropped
+    and the rest are resampled from their timestamps onto a uniform fs
+    grid (default: the trace's median frame rate), so gaps and dropped
+    frames keep their real duration.
+    """
+    t0 = time.perf_counter()
 
-        if s is not None:
-            signal.append(s[-1])
+    rgb, t = trace_rgb(trace)
+    if not fs:
+        fs = 1.0 / np.median(np.diff(t)) if len(t) > 1 else DEFAULT_FPS
+    _, rgb = resample_uniform(t, rgb.reshape(-1, 3), fs)
+    signal = registry.get_method(method).process(rgb, fs)
 
-    vs.release()
-    return np.array(signal)
+    if timings is not None:
+        timings["rppg"] = timings.get("rppg", 0.0) + time.perf_counter() - t0
+    return signal
 
 
 def compute_hr(signal, fs):
@@ -69,73 +77,124 @@ def compute_hr(signal, fs):
     return 60.0 / np.diff(peaks / fs)
 
 
-def main():
-    print("\n=== rPPG Evaluation ===\n")
-
-    # ---------- LOAD VIDEO ----------
-    cap = cv2.VideoCapture(VIDEO_PATH)
+def video_fps(video_path):
+    cap = cv2.VideoCapture(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
     cap.release()
+    return fps
 
-    print(f"Video FPS: {fps:.2f}")
 
-    # ---------- LOAD GROUND TRUTH ----------
-    ppg = np.loadtxt(PPG_PATH)
+def load_ppg(ppg_path):
+    ppg = np.loadtxt(ppg_path)
 
     # If PPG is multi-channel, take the first row
     if ppg.ndim > 1:
         ppg = ppg[0]
 
-    ppg = np.asarray(ppg).flatten()
-
-    print(f"PPG samples: {len(ppg)} @ {FS_PPG} Hz")
+    return np.asarray(ppg).flatten()
 
-    # ---------- EXTRACT rPPG ----------
-    print("Extracting rPPG signal...")
-    rppg = extract_rppg(VIDEO_PATH)
-    print(f"rPPG samples: {len(rppg)} @ {fps:.2f} FPS")
 
-    # ---------- BANDPASS ----------
-    ppg_f = bandpass(ppg, FS_PPG, LOW_HZ, HIGH_HZ)
+def score(ppg, fs_ppg, rppg, fps):
+    """
+    Band-pass, align and compare ground-truth PPG with an rPPG trace.
+    Returns (metrics dict, aligned signals, beat-wise HR series).
+    """
+    ppg_f = bandpass(ppg, fs_ppg, LOW_HZ, HIGH_HZ)
     rppg_f = bandpass(rppg, fps, LOW_HZ, HIGH_HZ)
 
-    # ---------- RESAMPLE ----------
     N = min(len(ppg_f), len(rppg_f))
+    if N < 2:
+        # e.g. no face found anywhere in the video: nothing to align
+        nan = float("nan")
+        empty = np.array([])
+        metrics = {"mae": nan, "corr": nan, "beats": 0}
+        return metrics, (empty, empty), (empty, empty)
+
     ppg_f = resample(ppg_f, N)
     rppg_f = resample(rppg_f, N)
 
-    # ---------- HR COMPUTATION ----------
-    hr_gt = compute_hr(ppg_f, FS_PPG)
+    hr_gt = compute_hr(ppg_f, fs_ppg)
     hr_rppg = compute_hr(rppg_f, fps)
 
     L = min(len(hr_gt), len(hr_rppg))
     hr_gt = hr_gt[:L]
     hr_rppg = hr_rppg[:L]
 
-    # ---------- METRICS ----------
-    mae = mean_absolute_error(hr_gt, hr_rppg)
-    corr = np.corrcoef(hr_gt, hr_rppg)[0, 1]
+    if L >= 2:
+        mae = mean_absolute_error(hr_gt, hr_rppg)
+        corr = np.corrcoef(hr_gt, hr_rppg)[0, 1]
+    else:
+        mae = corr = float("nan")
 
-    print("\n=== RESULTS ===")
-    print(f"HR MAE        : {mae:.2f} BPM")
-    print(f"Correlation   : {corr:.3f}")
+    metrics = {"mae": float(mae), "corr": float(corr), "beats": int(L)}
+    return metrics, (ppg_f, rppg_f), (hr_gt, hr_rppg)
 
-    # ---------- PLOTS ----------
-    plt.figure(figsize=(12, 4))
+
+def plot_results(signals, hrs, out_prefix=None):
+    """
+    Show the comparison plots, or save them as <out_prefix>_signals.png
+    and <out_prefix>_hr.png when a prefix is given (headless).
+    """
+    import matplotlib
+    if out_prefix is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ppg_f, rppg_f = signals
+    hr_gt, hr_rppg = hrs
+
+    fig = plt.figure(figsize=(12, 4))
     plt.plot(ppg_f, label="Ground Truth PPG")
     plt.plot(rppg_f, label="rPPG", alpha=0.7)
     plt.title("Bandpassed Signals (Aligned)")
     plt.legend()
-    plt.show()
+    if out_prefix is None:
+        plt.show()
+    else:
+        fig.savefig(f"{out_prefix}_signals.png")
+        plt.close(fig)
 
-    plt.figure(figsize=(10, 4))
+    fig = plt.figure(figsize=(10, 4))
     plt.plot(hr_gt, label="Ground Truth HR")
     plt.plot(hr_rppg, label="rPPG HR")
     plt.ylabel("BPM")
     plt.xlabel("Beat Index")
     plt.title("Heart Rate Comparison")
     plt.legend()
-    plt.show()
+    if out_prefix is None:
+        plt.show()
+    else:
+        fig.savefig(f"{out_prefix}_hr.png")
+        plt.close(fig)
+
+
+def main():
+    print("\n=== rPPG Evaluation ===\n")
+
+    # ---------- LOAD VIDEO ----------
+    fps = video_fps(VIDEO_PATH)
+
+    print(f"Video FPS: {fps:.2f}")
+
+    # ---------- LOAD GROUND TRUTH ----------
+    ppg = load_ppg(PPG_PATH)
+
+    print(f"PPG samples: {len(ppg)} @ {FS_PPG} Hz")
+
+    # ---------- EXTRACT rPPG ----------
+    print("Extracting rPPG signal...")
+    rppg = extract_rppg(VIDEO_PATH, fs=fps)
+    print(f"rPPG samples: {len(rppg)} @ {fps:.2f} FPS")
+
+    # ---------- METRICS ----------
+    metrics, signals, hrs = score(ppg, FS_PPG, rppg, fps)
+
+    print("\n=== RESULTS ===")
+    print(f"HR MAE        : {metrics['mae']:.2f} BPM")
+    print(f"Correlation   : {metrics['corr']:.3f}")
+
+    # ---------- PLOTS ----------
+    plot_results(signals, hrs)
 
     print("\nEvaluation complete.\n")
 
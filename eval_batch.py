@@ -0,0 +1,198 @@
+import argparse
+import csv
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import eval as rppg_eval
+from core.trace import TraceCache, extract_trace
+from rppg import registry
+
+
+FIELDS = [
+    "video", "method", "mae", "corr", "beats", "rppg_samples", "fps",
+    "decode_s", "landmarks_s", "roi_s", "rppg_s", "total_s", "error",
+]
+
+
+def load_manifest(path):
+    """
+    Read (video, ground_truth, fs) entries from a CSV with those column
+    names or a JSON list of objects. Relative paths are resolved against
+    the manifest's directory.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+
+    if path.endswith(".json"):
+        with open(path) as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    entries = []
+    for row in rows:
+        entries.append({
+            "video": os.path.join(base, row["video"]),
+            "ground_truth": os.path.join(base, row["ground_truth"]),
+            "fs": float(row["fs"]),
+        })
+    return entries
+
+
+def evaluate_entry(entry, methods, plot_dir=None, cache_dir=None):
+    """
+    Worker body: extract the video's ROI trace once, then score every
+    method on it against the ground truth. Never raises; failures are
+    reported in the row's `error` field. With a cache_dir, the trace is
+    reused across runs too.
+    """
+    rows = []
+    cache = TraceCache(cache_dir) if cache_dir is not None else None
+    video = entry["video"]
+    name = os.path.splitext(os.path.basename(video))[0]
+
+    timings = {}
+    t0 = time.perf_counter()
+    try:
+        fps = rppg_eval.video_fps(video)
+        ppg = rppg_eval.load_ppg(entry["ground_truth"])
+        if cache is not None:
+            trace = cache.load(video, timings=timings)
+        else:
+            trace = extract_trace(video, timings=timings)
+    except Exception:
+        return [_error_row(video, m, traceback.format_exc()) for m in methods]
+    extract_s = time.perf_counter() - t0
+
+    for method in methods:
+        t0 = time.perf_counter()
+        method_timings = dict(timings, rppg=0.0)
+        try:
+            rppg = rppg_eval.rppg_from_trace(
+                trace, method, method_timings, fps
+            )
+            metrics, signals, hrs = rppg_eval.score(
+                ppg, entry["fs"], rppg, fps
+            )
+            if plot_dir is not None:
+                rppg_eval.plot_results(
+                    signals, hrs,
+                    out_prefix=os.path.join(plot_dir, f"{name}_{method}")
+                )
+        except Exception:
+            rows.append(_error_row(video, method, traceback.format_exc()))
+            continue
+
+        row = {
+            "video": video,
+            "method": method,
+            "rppg_samples": len(rppg),
+            "fps": fps,
+            # The shared extraction is counted in every method's total
+            "total_s": extract_s + time.perf_counter() - t0,
+            "error": "",
+        }
+        row.update(metrics)
+        for stage in rppg_eval.STAGES:
+            row[f"{stage}_s"] = method_timings.get(stage, 0.0)
+        rows.append(row)
+
+    return rows
+
+
+def _error_row(video, method, error):
+    row = dict.fromkeys(FIELDS)
+    # Keep the table readable: only the final "ExcType: message" line
+    last_line = error.strip().splitlines()[-1]
+    row.update(video=video, method=method, error=last_line)
+    return row
+
+
+def run_batch(entries, methods, workers=None, plot_dir=None,
+              cache_dir=None):
+    if plot_dir is not None:
+        os.makedirs(plot_dir, exist_ok=True)
+
+    results = []
+    # Spawn: the parent has already imported MediaPipe / OpenCV via eval,
+    # and forking their threads can deadlock the workers
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp.get_context("spawn")
+    ) as pool:
+        futures = [
+            pool.submit(evaluate_entry, entry, methods, plot_dir, cache_dir)
+            for entry in entries
+        ]
+        for future in as_completed(futures):
+            for row in future.result():
+                results.append(row)
+                print(f"{row['method']:>6}  {row['video']}  "
+                      f"MAE={row['mae']}  r={row['corr']}"
+                      + ("  FAILED" if row["error"] else ""))
+
+    results.sort(key=lambda r: (r["video"], r["method"]))
+    return results
+
+
+def _json_safe(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def write_results(results, path):
+    """
+    Missing values (error rows, NaN metrics) are written as null in JSON
+    and as empty cells in CSV.
+    """
+    if path.endswith(".json"):
+        rows = [{k: _json_safe(v) for k, v in row.items()} for row in results]
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=2, allow_nan=False)
+        return
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate rPPG methods over a dataset manifest"
+    )
+    parser.add_argument("manifest", help="CSV/JSON of video, ground_truth, fs")
+    parser.add_argument("--methods", nargs="+",
+                        default=list(registry.METHODS),
+                        choices=list(registry.METHODS))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--out", default="eval_results.csv",
+                        help="results table (.csv or .json)")
+    parser.add_argument("--plot-dir", default=None,
+                        help="save per-video plots here (headless)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="reuse per-frame ROI traces stored here")
+    args = parser.parse_args()
+
+    entries = load_manifest(args.manifest)
+    print(f"Evaluating {len(entries)} videos x {len(args.methods)} methods")
+
+    t0 = time.perf_counter()
+    results = run_batch(
+        entries, args.methods, args.workers, args.plot_dir, args.cache_dir
+    )
+    write_results(results, args.out)
+
+    print(f"\nWrote {len(results)} rows to {args.out} "
+          f"in {time.perf_counter() - t0:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,85 @@
+import argparse
+
 import cv2
-import numpy as np
 
 from core.video_source import VideoSource
 from core.face import FaceLandmarkDetector
 from core.roi import ROIExtractor
-from rppg.green import GreenRPPG
-from rppg.filters import bandpass
-
-FPS = 30
+from pipeline.metrics import Metrics, MetricsServer
+from pipeline.monitor import StreamMonitor
+from ui.preview import tint_mask
 
 
 def main():
-    vs = VideoSource(0)
+    parser = argparse.ArgumentParser(description="ROI + face debug view")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on localhost:PORT")
+    parser.add_argument("--metrics-jsonl", default=None,
+                        help="append a metrics snapshot here periodically")
+    parser.add_argument("--metrics-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    # Stage timers cost nothing unless a metrics output is requested
+    metrics = Metrics(
+        enabled=args.metrics_port is not None or bool(args.metrics_jsonl),
+        jsonl_path=args.metrics_jsonl, dump_interval=args.metrics_interval
+    )
+    server = None
+    if args.metrics_port is not None:
+        server = MetricsServer(metrics, port=args.metrics_port).start()
+
+    vs = VideoSource(0, threaded=True)
     vs.open()
 
     face = FaceLandmarkDetector()
     roi = ROIExtractor()
-    rppg = GreenRPPG(FPS)
+    # Samples are placed by capture time on a grid at the nominal rate
+    monitor = StreamMonitor(vs.fps)
 
     while True:
-        frame = vs.read()
-        if frame is None:
+        with metrics.stage("decode"):
+            packet = vs.read_packet()
+        if packet is None:
             break
+        frame = packet.frame
 
-        landmarks, bbox = face.process(frame)
+        with metrics.stage("landmarks"):
+            landmarks, bbox = face.process(frame)
 
         if bbox:
             x1, y1, x2, y2 = bbox
             cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
 
-        if landmarks is not None:
-            roi_pixels, mask = roi.extract(frame, landmarks)
+        if landmarks is None:
+            metrics.count("face_lost_frames")
+        else:
+            with metrics.stage("roi"):
+                roi_stats = roi.extract_stats(frame, landmarks)
 
-            overlay = frame.copy()
-            overlay[mask == 255] = (0, 255, 0)
-            frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+            if roi_stats.mask is not None:
+                x1, y1, x2, y2 = roi_stats.bbox
+                tint_mask(frame[y1:y2, x1:x2], roi_stats.mask, alpha=0.3)
 
-            signal = rppg.update(roi_pixels)
-            if signal is not None and len(signal) > FPS:
-                filtered = bandpass(signal, FPS)
-                bpm = np.argmax(np.abs(np.fft.rfft(filtered))) * FPS / len(filtered)
-                cv2.putText(frame, f"HR peak ~ {bpm:.1f} Hz",
+            with metrics.stage("signal"):
+                monitor.update(roi_stats, packet.pts)
+                bpm, snr = monitor.spectral.estimate()
+            if bpm is not None:
+                cv2.putText(frame, f"HR ~ {bpm:.1f} BPM (SNR {snr:.1f} dB)",
                             (10, 30), cv2.FONT_HERSHEY_SIMPLEX,
                             0.7, (0, 255, 255), 2)
 
-        cv2.imshow("ROI + Face Debug", frame)
-        if cv2.waitKey(1) & 0xFF == 27:
+        with metrics.stage("render"):
+            cv2.imshow("ROI + Face Debug", frame)
+            key = cv2.waitKey(1) & 0xFF
+        metrics.set("dropped_frames", vs.dropped)
+        metrics.frame()
+        if key == 27:
             break
 
     vs.release()
     cv2.destroyAllWindows()
+    if server is not None:
+        server.stop()
 
 
 if __name__ == "__main__":
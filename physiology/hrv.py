@@ -1,5 +1,24 @@
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import welch
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import get_window, welch
+
+
+LF_BAND = (0.04, 0.15)
+HF_BAND = (0.15, 0.4)
+
+# One row per RR window; times are seconds from the first beat
+HRV_DTYPE = np.dtype([
+    ("start", np.int32),
+    ("t_end", np.float64),
+    ("hr", np.float32),
+    ("rmssd", np.float32),
+    ("sdnn", np.float32),
+    ("lf", np.float32),
+    ("hf", np.float32),
+    ("lf_hf", np.float32),
+])
 
 
 def compute_hr(rr_intervals):
@@ -15,22 +34,128 @@ def sdnn(rr_intervals):
     return np.std(rr_intervals)
 
 
+def resample_rr(rr_intervals, fs=4.0):
+    """
+    RR tachogram on a uniform fs grid. Each interval is placed at the
+    time of the beat that ends it, so irregular beats keep their timing.
+    Returns (grid times, values) with times relative to the first beat.
+    """
+    rr = np.asarray(rr_intervals, dtype=np.float64)
+    beat_t = np.cumsum(rr)
+    grid = np.arange(beat_t[0], beat_t[-1], 1.0 / fs)
+    return grid - beat_t[0] + rr[0], np.interp(grid, beat_t, rr)
+
+
 def lf_hf(rr_intervals, fs=4.0):
     if len(rr_intervals) < 4:
         return None
 
-    rr_interp = np.interp(
-        np.linspace(0, len(rr_intervals) - 1, len(rr_intervals) * 4),
-        np.arange(len(rr_intervals)),
-        rr_intervals
-    )
+    _, rr_interp = resample_rr(rr_intervals, fs)
+    if len(rr_interp) < 4:
+        return None
 
-    freqs, psd = welch(rr_interp, fs=fs)
+    freqs, psd = welch(rr_interp, fs=fs, nperseg=min(len(rr_interp), 256))
 
-    lf = psd[(freqs >= 0.04) & (freqs < 0.15)].sum()
-    hf = psd[(freqs >= 0.15) & (freqs < 0.4)].sum()
+    lf = psd[(freqs >= LF_BAND[0]) & (freqs < LF_BAND[1])].sum()
+    hf = psd[(freqs >= HF_BAND[0]) & (freqs < HF_BAND[1])].sum()
 
     if hf == 0:
         return None
 
     return lf / hf
+
+
+# ---------------- SLIDING-WINDOW ENGINE ---------------- #
+
+
+@lru_cache(maxsize=None)
+def _welch_plan(nperseg, fs):
+    """Hann taper, density scale and LF / HF bin masks for one segment size."""
+    win = get_window("hann", nperseg)
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / fs)
+
+    # scipy.signal.welch(scaling="density"), one-sided
+    scale = np.full(len(freqs), 2.0 / (fs * (win ** 2).sum()))
+    scale[0] /= 2
+    if nperseg % 2 == 0:
+        scale[-1] /= 2
+
+    lf = (freqs >= LF_BAND[0]) & (freqs < LF_BAND[1])
+    hf = (freqs >= HF_BAND[0]) & (freqs < HF_BAND[1])
+    return win, scale, lf, hf
+
+
+def sliding_hrv(rr_intervals, window=30, step=1, fs=4.0, nperseg=128):
+    """
+    HRV over every `window`-beat slice of an RR series (seconds), moving
+    by `step` beats, in one vectorized pass. Returns a HRV_DTYPE array.
+
+    Time-domain metrics match compute_hr / rmssd / sdnn on each slice.
+    LF / HF come from one 4 Hz, time-based resampling of the whole
+    series: Welch segments (nperseg samples, 50% overlap) are FFT'd once
+    and each window averages the segments that lie inside it, so
+    overlapping windows share their spectra. Windows shorter than one
+    segment get NaN in the frequency fields.
+    """
+    rr = np.asarray(rr_intervals, dtype=np.float64)
+    out = np.zeros(0, dtype=HRV_DTYPE)
+    if len(rr) < max(window, 2):
+        return out
+
+    windows = sliding_window_view(rr, window)[::step]
+    diffs = sliding_window_view(np.diff(rr), window - 1)[::step]
+    starts = np.arange(0, len(rr) - window + 1, step)
+    beat_t = np.cumsum(rr)
+
+    out = np.zeros(len(windows), dtype=HRV_DTYPE)
+    out["start"] = starts
+    out["t_end"] = beat_t[starts + window - 1] - beat_t[0] + rr[0]
+    out["hr"] = 60.0 / windows.mean(axis=1)
+    out["rmssd"] = np.sqrt((diffs ** 2).mean(axis=1))
+    out["sdnn"] = windows.std(axis=1)
+
+    lf, hf = _sliding_bands(rr, beat_t, starts, window, fs, nperseg)
+    out["lf"] = lf
+    out["hf"] = hf
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["lf_hf"] = np.where(hf > 0, lf / hf, np.nan)
+    return out
+
+
+def _sliding_bands(rr, beat_t, starts, window, fs, nperseg):
+    n = len(starts)
+    lf = np.full(n, np.nan)
+    hf = np.full(n, np.nan)
+
+    _, signal = resample_rr(rr, fs)
+    if len(signal) < nperseg:
+        return lf, hf
+
+    win, scale, lf_bins, hf_bins = _welch_plan(nperseg, fs)
+    hop = nperseg // 2
+
+    # Periodogram of every Welch segment of the whole series, at once
+    segs = sliding_window_view(signal, nperseg)[::hop]
+    segs = segs - segs.mean(axis=1, keepdims=True)
+    power = np.abs(np.fft.rfft(segs * win, axis=1)) ** 2 * scale
+
+    # Prefix sums over segments: any run of segments averages in O(1)
+    csum = np.zeros((len(segs) + 1, 2))
+    csum[1:, 0] = np.cumsum(power[:, lf_bins].sum(axis=1))
+    csum[1:, 1] = np.cumsum(power[:, hf_bins].sum(axis=1))
+
+    # Window i spans grid samples [a, b): from its first beat to its last
+    t0 = beat_t[0]
+    a = np.ceil((beat_t[starts] - t0) * fs).astype(int)
+    b = np.floor((beat_t[starts + window - 1] - t0) * fs).astype(int) + 1
+    b = np.minimum(b, len(signal))
+
+    first = -(-a // hop)
+    last = (b - nperseg) // hop     # inclusive
+    last = np.minimum(last, len(segs) - 1)
+    count = last - first + 1
+
+    ok = count > 0
+    lf[ok] = (csum[last[ok] + 1, 0] - csum[first[ok], 0]) / count[ok]
+    hf[ok] = (csum[last[ok] + 1, 1] - csum[first[ok], 1]) / count[ok]
+    return lf, hf
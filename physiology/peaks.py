@@ -1,6 +1,10 @@
+from collections import deque
+
 import numpy as np
 from scipy.signal import find_peaks
 
+from physiology.hrv import compute_hr, rmssd
+
 
 def detect_peaks(signal, fs):
     if len(signal) < fs:
@@ -13,3 +17,102 @@ def detect_peaks(signal, fs):
         return None
 
     return peaks
+
+
+class BeatTracker:
+    """
+    Online counterpart of detect_peaks(). Consumes filtered samples one
+    chunk at a time and confirms a beat once no higher local maximum can
+    follow within the refractory distance. Beat times are refined with
+    parabolic interpolation, and HR / RMSSD are only recomputed when a
+    new beat arrives.
+    """
+
+    def __init__(self, fs, min_interval=0.4, rr_size=10):
+        self.fs = fs
+        self.distance = int(min_interval * fs)
+
+        self.rr = deque(maxlen=rr_size)
+        self.hr = None
+        self.rmssd = None
+        self.last_beat = None
+
+        self._n = 0
+        self._y = deque(maxlen=3)
+        self._t = deque(maxlen=3)
+        self._candidate = None
+        self._last_idx = None
+
+    def update(self, samples, timestamps=None):
+        """
+        Returns the list of beat times confirmed by these samples, in
+        seconds (sample clock unless timestamps are given).
+        """
+        samples = np.atleast_1d(samples)
+        if timestamps is None:
+            timestamps = (self._n + np.arange(samples.size)) / self.fs
+        else:
+            timestamps = np.atleast_1d(timestamps)
+
+        beats = []
+        for y, t in zip(samples, timestamps):
+            self._y.append(float(y))
+            self._t.append(float(t))
+            self._n += 1
+
+            if len(self._y) < 3:
+                continue
+
+            # The middle sample is the earliest possible new maximum, so a
+            # candidate at least `distance` before it can no longer lose
+            k = self._n - 2
+            cand = self._candidate
+            if cand is not None and k - cand[0] >= self.distance:
+                beats.append(self._confirm(cand))
+                self._candidate = None
+
+            self._check_local_max(k)
+
+        return beats
+
+    def restart(self):
+        """
+        Forget the pending candidate and the last beat after a gap in the
+        signal, so no RR interval spans it. RR history and HR are kept.
+        """
+        self._y.clear()
+        self._t.clear()
+        self._candidate = None
+        self._last_idx = None
+        self.last_beat = None
+
+    def _check_local_max(self, k):
+        y0, y1, y2 = self._y
+        if not (y0 < y1 > y2):
+            return
+
+        if self._last_idx is not None and k - self._last_idx < self.distance:
+            return
+
+        # Parabolic vertex offset in samples, within [-0.5, 0.5]
+        denom = y0 - 2 * y1 + y2
+        offset = 0.5 * (y0 - y2) / denom if denom != 0 else 0.0
+        t0, t1, t2 = self._t
+        t = t1 + offset * 0.5 * (t2 - t0)
+
+        cand = self._candidate
+        if cand is None or y1 > cand[1]:
+            self._candidate = (k, y1, t)
+
+    def _confirm(self, cand):
+        k, _, t = cand
+        if self.last_beat is not None:
+            self.rr.append(t - self.last_beat)
+            if len(self.rr) >= 2:
+                rr = np.array(self.rr)
+                self.hr = compute_hr(rr)
+                self.rmssd = rmssd(rr)
+
+        self.last_beat = t
+        self._last_idx = k
+        return t
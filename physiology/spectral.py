@@ -0,0 +1,95 @@
+import numpy as np
+
+from rppg.buffer import RingBuffer
+
+
+class SpectralHR:
+    """
+    Heart rate from the spectrum of the last `window` seconds, kept up
+    to date with a sliding DFT: only the bins between low and high Hz
+    (plus one neighbour each side) are tracked, so every new sample
+    costs O(bins) instead of a full FFT of the window.
+
+    A Hann taper is applied in the frequency domain (0.5 X[k] -
+    0.25 X[k-1] - 0.25 X[k+1]) and the peak is refined by parabolic
+    interpolation. snr is the power within two bins of the peak and of
+    its first harmonic over the rest of the band, in dB. The bins are
+    recomputed exactly once per window of samples, so rounding drift
+    never accumulates.
+    """
+
+    def __init__(self, fs, window=10.0, low=0.7, high=3.0):
+        self.fs = fs
+        self.n = int(round(window * fs))
+        self.buffer = RingBuffer(self.n)
+
+        k_lo = int(np.ceil(low * self.n / fs))
+        k_hi = int(np.floor(high * self.n / fs))
+        self.bins = np.arange(k_lo, k_hi + 1)
+
+        # Tracked bins k_lo - 1 .. k_hi + 1; X[k] = sum_i x[n - i] z_k^i
+        k = np.arange(k_lo - 1, k_hi + 2)
+        self._z = np.exp(-2j * np.pi * k / self.n)
+        self._x = np.zeros(len(k), dtype=np.complex128)
+        # Exact recompute: the oldest-first window times z^(N-1-m)
+        powers = np.arange(self.n - 1, -1, -1)[:, None]
+        self._basis = self._z[None, :] ** powers
+        self._since_resync = 0
+
+        self.hr = None
+        self.snr = None
+
+    def update(self, samples):
+        """Slide the window over new (band-passed) samples."""
+        for x in np.atleast_1d(samples):
+            old = 0.0
+            if len(self.buffer) == self.n:
+                old = self.buffer.view()[0]
+            self.buffer.append(x)
+
+            # X <- z X + x_new - z^N x_old, and z^N = 1 for integer bins
+            self._x *= self._z
+            self._x += x - old
+
+            self._since_resync += 1
+            if self._since_resync >= self.n:
+                self._x = self.buffer.view() @ self._basis
+                self._since_resync = 0
+
+    def estimate(self):
+        """
+        (HR in BPM, SNR in dB) from the current window, also stored as
+        .hr / .snr; (None, None) until a full window has been seen.
+        """
+        if len(self.buffer) < self.n:
+            return None, None
+
+        x = self._x
+        tapered = 0.5 * x[1:-1] - 0.25 * (x[:-2] + x[2:])
+        power = tapered.real ** 2 + tapered.imag ** 2
+
+        i = int(np.argmax(power))
+        delta = 0.0
+        if 0 < i < len(power) - 1:
+            a, b, c = np.sqrt(power[i - 1:i + 2])
+            denom = a - 2 * b + c
+            if denom != 0:
+                delta = 0.5 * (a - c) / denom
+
+        peak = self.bins[i] + delta
+        self.hr = 60.0 * peak * self.fs / self.n
+
+        signal = (np.abs(self.bins - peak) <= 2) | (
+            np.abs(self.bins - 2 * peak) <= 2
+        )
+        noise = power[~signal].sum()
+        total = power[signal].sum()
+        self.snr = 10 * np.log10(total / noise) if noise > 0 else np.inf
+        return self.hr, self.snr
+
+    def reset(self):
+        self.buffer.clear()
+        self._x[:] = 0
+        self._since_resync = 0
+        self.hr = None
+        self.snr = None
@@ -0,0 +1,347 @@
+import argparse
+import heapq
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from core.face import FaceLandmarkDetector
+from core.landmarks import landmark_subset
+from core.roi import ROIExtractor, ROIStats
+from core.video_source import VideoSource
+from pipeline.monitor import StreamMonitor
+
+
+class FrameRing:
+    """
+    Fixed pool of frame-sized slots in one shared-memory block. Only slot
+    indices travel through the queues; the pixels are never pickled.
+    """
+
+    def __init__(self, shape, slots, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        nbytes = int(np.prod(self.shape)) * slots
+
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.frames = np.ndarray(
+            (slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf
+        )
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ---------------- STAGE KERNELS ---------------- #
+# Messages are (slot, seq, timestamp, ...). None is the end-of-stream
+# sentinel; every stage forwards one per downstream consumer.
+
+
+def _decode_stage(source, ring_spec, free_q, out_q, stop, n_consumers):
+    ring = FrameRing(*ring_spec)
+    vs = VideoSource(source)
+    vs.open()
+    try:
+        while not stop.is_set():
+            packet = vs.read_packet()
+            if packet is None:
+                break
+
+            # Backpressure: blocks while every slot is still in flight
+            slot = free_q.get()
+            if packet.frame.shape != ring.shape:
+                packet = packet._replace(
+                    frame=cv2.resize(packet.frame, ring.shape[1::-1])
+                )
+            ring.frames[slot][...] = packet.frame
+            out_q.put((slot, packet.seq, packet.timestamp, packet.pts))
+    finally:
+        vs.release()
+        for _ in range(n_consumers):
+            out_q.put(None)
+        ring.close()
+
+
+def _landmark_stage(ring_spec, in_q, out_q, detector_kwargs, independent):
+    ring = FrameRing(*ring_spec)
+    if independent:
+        # Frames reach this worker in no fixed order, so no state may
+        # carry across them: static FaceMesh, no tracking, no smoothing
+        detector_kwargs = dict(
+            detector_kwargs, detect_interval=1, static_image_mode=True
+        )
+    face = FaceLandmarkDetector(**detector_kwargs)
+    if independent:
+        face.alpha = 0.0
+    try:
+        while True:
+            msg = in_q.get()
+            if msg is None:
+                break
+            slot, seq, ts, pts = msg
+            landmarks, bbox = face.process(ring.frames[slot])
+            out_q.put((slot, seq, ts, pts, landmarks, bbox))
+    finally:
+        out_q.put(None)
+        ring.close()
+
+
+def _roi_stage(ring_spec, in_q, free_q, out_q, n_producers, regions):
+    ring = FrameRing(*ring_spec)
+    roi = ROIExtractor(regions=regions)
+    done = 0
+    try:
+        while done < n_producers:
+            msg = in_q.get()
+            if msg is None:
+                done += 1
+                continue
+
+            slot, seq, ts, pts, landmarks, bbox = msg
+            stats = None
+            if landmarks is not None:
+                stats = roi.extract_stats(ring.frames[slot], landmarks)
+                # The crop mask stays behind; only the statistics move on
+                stats = (stats.mean, stats.count, stats.bbox)
+
+            free_q.put(slot)
+            out_q.put((seq, ts, pts, bbox, stats))
+    finally:
+        out_q.put(None)
+        ring.close()
+
+
+def _signal_stage(in_q, out_q, fps, method):
+    monitor = StreamMonitor(fps, method=method)
+    pending = []
+    # Decode numbers frames from 0, so the first frame to emit is known
+    next_seq = 0
+
+    def emit(seq, ts, pts, bbox, stats):
+        roi = None if stats is None else ROIStats(*stats, None)
+        monitor.update(roi, pts)
+        out_q.put({
+            "seq": seq,
+            "timestamp": ts,
+            "face": bbox is not None,
+            "hr": monitor.hr,
+            "rmssd": monitor.rmssd,
+            "stress": monitor.stress,
+        })
+
+    try:
+        while True:
+            msg = in_q.get()
+            if msg is None:
+                break
+
+            # Several landmark workers may finish out of order; the signal
+            # chain needs frames back in capture order
+            heapq.heappush(pending, msg)
+            while pending and pending[0][0] == next_seq:
+                emit(*heapq.heappop(pending))
+                next_seq += 1
+
+        while pending:
+            emit(*heapq.heappop(pending))
+    finally:
+        out_q.put(None)
+
+
+# ---------------- ENGINE ---------------- #
+
+
+class PipelineEngine:
+    """
+    Runs decode, landmarks, ROI and signal/physiology as separate worker
+    processes connected by bounded queues. Frames are handed off through
+    a FrameRing; a decoded frame holds its slot until the ROI stage is
+    done with it, so `slots` bounds the number of frames in flight.
+
+    Workers are spawned rather than forked: MediaPipe and OpenCV start
+    threads in the parent, and forking those deadlocks the children.
+
+    With landmark_workers > 1, frames are dealt to whichever worker is
+    free, so a worker never sees consecutive frames. Those workers run
+    FaceMesh in static-image mode with tracking (detect_interval) and EMA
+    smoothing disabled; only a single landmark worker keeps video-mode
+    temporal state.
+    """
+
+    def __init__(self, source, fps=None, method="green", slots=8,
+                 queue_size=4, landmark_workers=1, detector_kwargs=None):
+        self.source = source
+        self.fps = fps
+        self.method = method
+        self.slots = slots
+        self.queue_size = queue_size
+        self.landmark_workers = landmark_workers
+        self.detector_kwargs = detector_kwargs or {}
+        # Rows of each landmark region in the detector's output, which
+        # is only a subset of the mesh when detector_kwargs has regions
+        _, self.regions = landmark_subset(self.detector_kwargs.get("regions"))
+
+        self.ring = None
+        self.procs = []
+        self.frames = 0
+        self.elapsed = None
+
+    def _probe_shape(self):
+        vs = VideoSource(self.source)
+        vs.open()
+        frame = vs.read()
+        if self.fps is None:
+            # Analysis grid rate; frames are placed by their own pts
+            self.fps = vs.fps
+        vs.release()
+        if frame is None:
+            raise RuntimeError("Unable to read from video source")
+        return frame.shape
+
+    def start(self):
+        self.ring = FrameRing(self._probe_shape(), self.slots)
+        ring_spec = (self.ring.shape, self.slots, self.ring.name)
+
+        ctx = mp.get_context("spawn")
+        self.stop_event = ctx.Event()
+        self.free_q = ctx.Queue()
+        for slot in range(self.slots):
+            self.free_q.put(slot)
+
+        # Every queue stays referenced from the engine: Process.start()
+        # drops its args, and a collected queue unlinks the semaphores
+        # the spawned children are still about to attach to
+        self.decoded_q = ctx.Queue(self.queue_size)
+        self.landmark_q = ctx.Queue(self.queue_size)
+        self.roi_q = ctx.Queue(self.queue_size)
+        self.result_q = ctx.Queue(self.queue_size)
+
+        n = self.landmark_workers
+        self.procs = [
+            ctx.Process(target=_decode_stage, args=(
+                self.source, ring_spec, self.free_q, self.decoded_q,
+                self.stop_event, n
+            ), name="decode"),
+            *[ctx.Process(target=_landmark_stage, args=(
+                ring_spec, self.decoded_q, self.landmark_q,
+                self.detector_kwargs, n > 1
+            ), name=f"landmarks-{i}") for i in range(n)],
+            ctx.Process(target=_roi_stage, args=(
+                ring_spec, self.landmark_q, self.free_q, self.roi_q, n,
+                self.regions
+            ), name="roi"),
+            ctx.Process(target=_signal_stage, args=(
+                self.roi_q, self.result_q, self.fps, self.method
+            ), name="signal"),
+        ]
+
+        for p in self.procs:
+            p.daemon = True
+            p.start()
+        self._t0 = time.perf_counter()
+
+    def results(self):
+        """
+        Yields one result dict per frame, in capture order, until the
+        source is exhausted or stop() is called. Raises RuntimeError if a
+        worker dies instead of waiting on it forever.
+        """
+        while True:
+            try:
+                msg = self.result_q.get(timeout=0.5)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if msg is None:
+                break
+            self.frames += 1
+            yield msg
+        self.elapsed = time.perf_counter() - self._t0
+
+    def _check_workers(self):
+        for p in self.procs:
+            if p.exitcode not in (None, 0):
+                raise RuntimeError(
+                    f"Pipeline stage '{p.name}' exited with code {p.exitcode}"
+                )
+
+    def throughput(self):
+        if not self.elapsed:
+            return None
+        return self.frames / self.elapsed
+
+    def stop(self, timeout=5.0):
+        self.stop_event.set()
+
+        # Drain so no stage stays blocked on a full queue
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if self.result_q.get(timeout=0.1) is None:
+                    break
+            except queue.Empty:
+                if not any(p.is_alive() for p in self.procs):
+                    break
+
+        for p in self.procs:
+            p.join(timeout=max(0.0, deadline - time.monotonic()))
+            if p.is_alive():
+                p.terminate()
+        self.procs = []
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def run(self):
+        self.start()
+        try:
+            for result in self.results():
+                yield result
+        finally:
+            self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure multi-process pipeline throughput"
+    )
+    parser.add_argument("source", help="video file path or device index")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="analysis rate (default: the source's)")
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--landmark-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    engine = PipelineEngine(
+        source, fps=args.fps, slots=args.slots,
+        landmark_workers=args.landmark_workers
+    )
+    for _ in engine.run():
+        pass
+
+    print(f"frames     : {engine.frames}")
+    print(f"elapsed    : {engine.elapsed:.2f} s")
+    print(f"throughput : {engine.throughput():.1f} FPS "
+          f"({mp.cpu_count()} cores, "
+          f"{args.landmark_workers} landmark workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from rppg.buffer import RingBuffer
+
+
+# Prometheus histogram upper bounds, in seconds (+Inf is implicit)
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+_DISABLED = nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class Metrics:
+    """
+    Per-stage latency, FPS and event counters for a frame loop.
+
+        with metrics.stage("landmarks"):
+            landmarks, bbox = face.process(frame)
+        ...
+        metrics.frame()
+
+    Each stage keeps a rolling window of its last `window` latencies (for
+    percentiles) and cumulative Prometheus-style bucket counts. With
+    enabled=False, stage() hands back a shared no-op context and the
+    other calls return immediately.
+    """
+
+    def __init__(self, enabled=True, window=300, jsonl_path=None,
+                 dump_interval=10.0):
+        self.enabled = enabled
+        self.window = window
+        self.jsonl_path = jsonl_path
+        self.dump_interval = dump_interval
+
+        self.counters = {}
+        self.gauges = {}
+        self._stages = {}
+        self._frame_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._last_dump = time.monotonic()
+
+    # ---------------- RECORDING ---------------- #
+
+    def stage(self, name):
+        if not self.enabled:
+            return _DISABLED
+        return _StageTimer(self, name)
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            st = self._stages.get(name)
+            if st is None:
+                st = self._stages[name] = {
+                    "recent": RingBuffer(self.window),
+                    "buckets": [0] * (len(BUCKETS) + 1),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            st["recent"].append(seconds)
+            st["buckets"][bisect.bisect_left(BUCKETS, seconds)] += 1
+            st["sum"] += seconds
+            st["count"] += 1
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    def frame(self):
+        """Mark the end of one frame; also drives the JSON-lines dump."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._frame_times.append(now)
+        if self.jsonl_path and now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            self.dump(self.jsonl_path)
+
+    # ---------------- READING ---------------- #
+
+    def fps(self):
+        with self._lock:
+            times = self._frame_times
+            if len(times) < 2 or times[-1] == times[0]:
+                return None
+            return (len(times) - 1) / (times[-1] - times[0])
+
+    def snapshot(self):
+        """Plain dict of current numbers (latencies in milliseconds)."""
+        fps = self.fps()
+        with self._lock:
+            stages = {}
+            for name, st in self._stages.items():
+                recent = st["recent"].view() * 1e3
+                p50, p95, p99 = np.percentile(recent, (50, 95, 99))
+                stages[name] = {
+                    "p50_ms": float(p50),
+                    "p95_ms": float(p95),
+                    "p99_ms": float(p99),
+                    "mean_ms": float(recent.mean()),
+                    "count": st["count"],
+                }
+            return {
+                "time": time.time(),
+                "fps": fps,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "stages": stages,
+            }
+
+    def dump(self, path):
+        with open(path, "a") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def summary(self):
+        """Short multi-line text for a status / log box."""
+        snap = self.snapshot()
+        fps = snap["fps"]
+        lines = [f"FPS: {fps:.1f}" if fps else "FPS: -"]
+        for name, st in snap["stages"].items():
+            lines.append(
+                f"{name}: {st['p50_ms']:.1f} ms (p95 {st['p95_ms']:.1f})"
+            )
+        for name, value in {**snap["counters"], **snap["gauges"]}.items():
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+    def prometheus(self, prefix="stress"):
+        """Prometheus text exposition format (version 0.0.4)."""
+        fps = self.fps()
+        out = []
+        with self._lock:
+            name = f"{prefix}_stage_seconds"
+            out.append(f"# TYPE {name} histogram")
+            for stage, st in self._stages.items():
+                cumulative = np.cumsum(st["buckets"])
+                for bound, n in zip(BUCKETS + ("+Inf",), cumulative):
+                    out.append(
+                        f'{name}_bucket{{stage="{stage}",le="{bound}"}} {n}'
+                    )
+                out.append(f'{name}_sum{{stage="{stage}"}} {st["sum"]}')
+                out.append(f'{name}_count{{stage="{stage}"}} {st["count"]}')
+
+            for counter, value in self.counters.items():
+                out.append(f"# TYPE {prefix}_{counter}_total counter")
+                out.append(f"{prefix}_{counter}_total {value}")
+
+            gauges = dict(self.gauges)
+            if fps is not None:
+                gauges["fps"] = fps
+            for gauge, value in gauges.items():
+                out.append(f"# TYPE {prefix}_{gauge} gauge")
+                out.append(f"{prefix}_{gauge} {value}")
+        return "\n".join(out) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves Metrics.prometheus() at http://host:port/metrics from a daemon
+    thread. Binds to localhost by default.
+    """
+
+    def __init__(self, metrics, host="127.0.0.1", port=9108):
+        metrics_ref = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics_ref.prometheus().encode()
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", "text/plain; version=0.0.4"
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, name="MetricsServer",
+            daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
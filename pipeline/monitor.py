@@ -0,0 +1,91 @@
+from collections import deque
+
+from core.roi import ROIStats, channel_means
+from physiology.peaks import BeatTracker
+from physiology.spectral import SpectralHR
+from rppg import registry
+from rppg.filters import StreamingBandpass
+from rppg.resample import StreamingResampler
+from stress.index import StressScorer
+
+
+class StreamMonitor:
+    """
+    Per-stream signal chain: ROI stats -> rPPG -> streaming band-pass ->
+    beat tracking -> HR / RMSSD -> stress index. Holds no video or
+    detector state, so it can run wherever the ROI stats end up.
+
+    Colour means are resampled from their capture timestamps onto a
+    uniform `fps` grid before the rPPG stage, so dropped frames or a
+    camera running off its nominal rate do not skew HR. Gaps longer
+    than max_gap seconds restart the grid and the beat chain.
+
+    The filtered signal also feeds a sliding-DFT SpectralHR, whose
+    estimate() gives a spectral HR and SNR to cross-check the beats.
+    """
+
+    def __init__(self, fps, method="green", history=60, max_gap=1.0):
+        self.rppg = registry.create(method, fps)
+        self.fps = fps
+        self.resampler = StreamingResampler(fps, max_gap)
+        self.bandpass = StreamingBandpass(fps)
+        self.beats = BeatTracker(fps)
+        self.spectral = SpectralHR(fps)
+        self.scorer = StressScorer(history)
+
+        self.hr_history = deque(maxlen=history)
+        self.rmssd_history = deque(maxlen=history)
+        self.stress_history = deque(maxlen=history)
+
+        self.hr = None
+        self.rmssd = None
+        self.stress = None
+        self.frames = 0
+        self.face_frames = 0
+
+    def update(self, roi, timestamp=None):
+        """
+        Feed one frame's ROI (ROIStats, pixel array, or None when no face
+        was found) captured at `timestamp` seconds; without one, frames
+        are taken to be 1 / fps apart. Returns True when a new beat
+        updated HR / RMSSD.
+        """
+        if timestamp is None:
+            timestamp = self.frames / self.fps
+        self.frames += 1
+        if roi is None:
+            return False
+        self.face_frames += 1
+
+        means = channel_means(roi)
+        if means is None:
+            return False
+        count = roi.count if isinstance(roi, ROIStats) else len(roi)
+
+        times, samples = self.resampler.push(timestamp, means)
+        if self.resampler.restarted:
+            # Nothing from before the gap may leak into the new segment
+            self.rppg.buffer.clear()
+            self.bandpass.reset()
+            self.beats.restart()
+            self.spectral.reset()
+
+        beats = []
+        for t, sample in zip(times, samples):
+            signal = self.rppg.update(ROIStats(sample, count, None, None))
+            if signal is None:
+                continue
+            filtered = self.bandpass.process(signal[-1])
+            self.spectral.update(filtered)
+            beats += self.beats.update(filtered, t)
+        if not beats or self.beats.hr is None:
+            return False
+
+        self.hr = self.beats.hr
+        self.rmssd = self.beats.rmssd
+        self.hr_history.append(self.hr)
+        self.rmssd_history.append(self.rmssd)
+
+        self.stress = self.scorer.update(self.hr, self.rmssd)
+        self.stress_history.append(self.stress)
+        return True
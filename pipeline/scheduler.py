@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from core.face import FaceLandmarkDetector
+from core.roi import ROIExtractor
+from core.video_source import VideoSource
+from pipeline.monitor import StreamMonitor
+from pipeline.service import parse_source
+
+
+class Stream:
+    """
+    One source and its isolated signal state: a StreamMonitor per face
+    id, so several faces in one frame never share an rPPG chain.
+    """
+
+    def __init__(self, name, source, method="green", budget=0.1,
+                 max_missing=30):
+        self.name = name
+        self.source = source
+        self.method = method
+        self.budget = budget
+        self.max_missing = max_missing
+
+        live = not (isinstance(source, str) and os.path.exists(source))
+        self.vs = VideoSource(source, threaded=live)
+        self.vs.open()
+        self.live = live
+        self.fps = self.vs.fps
+
+        self.roi = ROIExtractor()     # mask templates are per stream
+        self.monitors = {}
+        self.tracks = {}      # face id -> (centre, frames since seen)
+        self._next_id = 0
+
+        self.frames = 0
+        self.skipped = 0
+        self.over_budget = 0
+        self.latency = None
+        self.done = False
+
+    def poll(self):
+        """Newest frame without blocking (live) or the next frame (file)."""
+        if self.live:
+            packet = self.vs.read_packet(timeout=0)
+        else:
+            packet = self.vs.read_packet()
+        if packet is None and self.vs.exhausted:
+            self.done = True
+        return packet
+
+    def assign(self, faces):
+        """
+        Match this frame's faces to existing ids by nearest bbox centre
+        (within half a face width); unmatched faces start a new chain and
+        ids unseen for max_missing frames are dropped.
+        """
+        ids = []
+        free = dict(self.tracks)
+        for _, (x1, y1, x2, y2) in faces:
+            centre = np.array(((x1 + x2) / 2, (y1 + y2) / 2))
+            best, best_dist = None, 0.5 * max(x2 - x1, 1)
+            for face_id, (prev, _) in free.items():
+                dist = np.hypot(*(centre - prev))
+                if dist < best_dist:
+                    best, best_dist = face_id, dist
+            if best is None:
+                best = self._next_id
+                self._next_id += 1
+                self.monitors[best] = StreamMonitor(self.fps, self.method)
+            else:
+                del free[best]
+            self.tracks[best] = (centre, 0)
+            ids.append(best)
+
+        for face_id, (centre, missing) in free.items():
+            if missing + 1 > self.max_missing:
+                del self.tracks[face_id]
+                del self.monitors[face_id]
+            else:
+                self.tracks[face_id] = (centre, missing + 1)
+        return ids
+
+    def close(self):
+        self.vs.release()
+
+
+class StreamScheduler:
+    """
+    Multiplexes many video streams in one process over a small pool of
+    shared FaceMesh instances.
+
+    Each stream has at most one frame in flight, so its signal state is
+    only ever touched by one worker at a time and stays in capture
+    order. Whenever a detector is free, the waiting stream whose frame
+    is closest to its latency budget goes first (earliest deadline);
+    live frames already older than their budget are skipped, and live
+    sources only ever offer their newest frame.
+
+    Pool detectors run FaceMesh in static-image mode with no tracking or
+    smoothing, because consecutive calls come from different streams.
+    With max_faces > 1, every face gets its own StreamMonitor.
+    """
+
+    def __init__(self, detectors=2, max_faces=1, detector_factory=None):
+        if detector_factory is None:
+            def detector_factory():
+                return FaceLandmarkDetector(
+                    static_image_mode=True, max_faces=max_faces
+                )
+
+        self.n_detectors = detectors
+        self.max_faces = max_faces
+        self.pool = queue.Queue()
+        for _ in range(detectors):
+            self.pool.put(detector_factory())
+
+        self.streams = {}
+
+    def add_stream(self, name, source, method="green", budget=0.1):
+        """budget: seconds a live frame may wait before it is skipped."""
+        self.streams[name] = Stream(name, source, method, budget)
+        return self.streams[name]
+
+    def run(self):
+        """
+        Yields one result dict per processed frame:
+        {"stream", "seq", "timestamp", "latency", "faces": [...]} where
+        each face is {"id", "bbox", "hr", "rmssd", "stress"}.
+        """
+        busy = {}    # future -> stream
+        waiting = {}    # stream name -> packet
+        clock = time.monotonic
+
+        with ThreadPoolExecutor(self.n_detectors) as executor:
+            try:
+                while True:
+                    for stream in self.streams.values():
+                        if (stream.done or stream.name in waiting
+                                or stream in busy.values()):
+                            continue
+                        packet = stream.poll()
+                        if packet is not None:
+                            waiting[stream.name] = packet
+
+                    if not waiting and not busy:
+                        if all(s.done for s in self.streams.values()):
+                            break
+                        time.sleep(0.001)
+                        continue
+
+                    # Earliest deadline first over the free detectors
+                    order = sorted(
+                        waiting,
+                        key=lambda n: waiting[n].timestamp
+                        + self.streams[n].budget
+                    )
+                    for name in order:
+                        if len(busy) >= self.n_detectors:
+                            break
+                        stream = self.streams[name]
+                        packet = waiting.pop(name)
+                        if (stream.live and clock() - packet.timestamp
+                                > stream.budget):
+                            stream.skipped += 1
+                            continue
+                        future = executor.submit(
+                            self._process, stream, packet
+                        )
+                        busy[future] = stream
+
+                    if busy:
+                        done, _ = wait(
+                            busy, timeout=0.01, return_when=FIRST_COMPLETED
+                        )
+                        for future in done:
+                            del busy[future]
+                            yield future.result()
+            finally:
+                for future in busy:
+                    future.cancel()
+                for stream in self.streams.values():
+                    stream.close()
+
+    def _process(self, stream, packet):
+        detector = self.pool.get()
+        try:
+            faces = detector.detect_all(packet.frame)
+        finally:
+            self.pool.put(detector)
+
+        results = []
+        for face_id, (landmarks, bbox) in zip(stream.assign(faces), faces):
+            monitor = stream.monitors[face_id]
+            stats = stream.roi.extract_stats(packet.frame, landmarks)
+            monitor.update(stats, packet.pts)
+            results.append({
+                "id": face_id,
+                "bbox": bbox,
+                "hr": monitor.hr,
+                "rmssd": monitor.rmssd,
+                "stress": monitor.stress,
+            })
+
+        latency = time.monotonic() - packet.timestamp
+        stream.frames += 1
+        stream.latency = latency
+        stream.over_budget += latency > stream.budget
+        return {
+            "stream": stream.name,
+            "seq": packet.seq,
+            "timestamp": packet.timestamp,
+            "latency": latency,
+            "faces": results,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Monitor several video sources in one process"
+    )
+    parser.add_argument("sources", nargs="+",
+                        help="video files, device indices or stream URLs")
+    parser.add_argument("--detectors", type=int, default=2,
+                        help="shared FaceMesh instances")
+    parser.add_argument("--max-faces", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=0.1,
+                        help="seconds a live frame may wait")
+    args = parser.parse_args()
+
+    sched = StreamScheduler(args.detectors, args.max_faces)
+    for i, source in enumerate(args.sources):
+        sched.add_stream(f"stream-{i}", parse_source(source),
+                         budget=args.budget)
+
+    for result in sched.run():
+        for face in result["faces"]:
+            print(json.dumps({
+                "stream": result["stream"],
+                "seq": result["seq"],
+                "face": face["id"],
+                "hr": None if face["hr"] is None else float(face["hr"]),
+                "stress": (None if face["stress"] is None
+                           else float(face["stress"])),
+            }))
+
+
+if __name__ == "__main__":
+    main()
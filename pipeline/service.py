@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+
+from core.face import FaceLandmarkDetector
+from core.roi import ROIExtractor, combine_regions
+from core.video_source import VideoSource
+from pipeline.metrics import Metrics, MetricsServer
+from pipeline.monitor import StreamMonitor
+from pipeline.session import SessionRecorder
+from rppg import registry
+
+
+def parse_source(source):
+    """Device index for digit strings, otherwise a file path or URL."""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+def open_sink(target):
+    """
+    "-" is stdout, "tcp://host:port" and "unix:///path" connect a socket.
+    Returns a line-buffered text file object.
+    """
+    if target in (None, "-"):
+        return sys.stdout
+
+    if target.startswith("tcp://"):
+        host, port = target[len("tcp://"):].rsplit(":", 1)
+        sock = socket.create_connection((host, int(port)))
+    elif target.startswith("unix://"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target[len("unix://"):])
+    else:
+        raise ValueError(f"Unknown output target: {target}")
+
+    return sock.makefile("w", buffering=1)
+
+
+class HeadlessMonitor:
+    """
+    Full VideoSource -> FaceLandmarkDetector -> ROI -> StreamMonitor
+    chain with no rendering. Every `interval` seconds of stream time one
+    JSON object is written to `sink`:
+
+        {"source", "t", "frames", "hr", "rmssd", "stress", "quality"}
+
+    quality is the fraction of frames in the window with a usable face.
+    Stream time is each frame's pts (media time for files, capture time
+    for live sources), so files are processed as fast as they decode and
+    dropped or late frames never skew the physiology.
+
+    With `record` set to a path, every frame's per-region ROI means,
+    bbox, tracking landmarks and live HR / RMSSD / stress are written
+    there with SessionRecorder.
+    """
+
+    def __init__(self, source, sink=None, method="green", interval=1.0,
+                 detector_kwargs=None, metrics=None, record=None):
+        self.source = parse_source(source)
+        self.sink = sink if sink is not None else sys.stdout
+        self.method = method
+        self.interval = interval
+        self.detector_kwargs = detector_kwargs or {}
+        self.metrics = metrics if metrics is not None else Metrics(False)
+        self.record = record
+
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        # Files must not drop frames; live sources keep the newest frame
+        live = not (isinstance(self.source, str)
+                    and os.path.exists(self.source))
+        vs = VideoSource(self.source, threaded=live)
+        vs.open()
+
+        fps = vs.fps
+        face = FaceLandmarkDetector(**self.detector_kwargs)
+        roi = ROIExtractor(regions=face.regions)
+        monitor = StreamMonitor(fps, method=self.method)
+        metrics = self.metrics
+
+        recorder = None
+        if self.record:
+            ids = face.track_ids if face.indices is None else [
+                face.indices[i] for i in face.track_ids
+            ]
+            recorder = SessionRecorder(self.record, len(ids), meta={
+                "source": str(self.source),
+                "fps": fps,
+                "method": self.method,
+                "landmark_ids": [int(i) for i in ids],
+            })
+
+        window_end = self.interval
+        frames = face_frames = 0
+        emitted = 0
+        t = 0.0
+
+        try:
+            while not self._stop.is_set():
+                with metrics.stage("decode"):
+                    packet = vs.read_packet()
+                if packet is None:
+                    break
+
+                t = packet.pts
+                while t >= window_end:
+                    if frames:
+                        self._emit(window_end, frames, face_frames, monitor)
+                        emitted += 1
+                    frames = face_frames = 0
+                    window_end += self.interval
+
+                with metrics.stage("landmarks"):
+                    landmarks, bbox = face.process(packet.frame)
+
+                stats = regions = None
+                if landmarks is None:
+                    metrics.count("face_lost_frames")
+                else:
+                    with metrics.stage("roi"):
+                        if recorder is None:
+                            stats = roi.extract_stats(
+                                packet.frame, landmarks
+                            )
+                        else:
+                            regions = roi.extract_region_stats(
+                                packet.frame, landmarks
+                            )
+                            stats = combine_regions(regions)
+                    face_frames += stats.count > 0
+
+                with metrics.stage("signal"):
+                    monitor.update(stats, t)
+
+                if recorder is not None:
+                    recorder.record(
+                        t, packet.seq, regions, bbox,
+                        None if landmarks is None
+                        else landmarks[face.track_ids],
+                        monitor.hr, monitor.rmssd, monitor.stress,
+                    )
+
+                frames += 1
+                metrics.set("dropped_frames", vs.dropped)
+                metrics.frame()
+
+            if frames:
+                self._emit(t, frames, face_frames, monitor)
+                emitted += 1
+        finally:
+            vs.release()
+            if recorder is not None:
+                recorder.close()
+
+        return emitted
+
+    def _emit(self, t, frames, face_frames, monitor):
+        record = {
+            "source": str(self.source),
+            "t": round(t, 3),
+            "frames": frames,
+            "hr": _number(monitor.hr),
+            "rmssd": _number(monitor.rmssd),
+            "stress": _number(monitor.stress),
+            "quality": round(face_frames / frames, 3),
+        }
+        self.sink.write(json.dumps(record) + "\n")
+        self.sink.flush()
+
+
+def _number(value):
+    return None if value is None else float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Headless stress monitor: JSON lines per window"
+    )
+    parser.add_argument("source",
+                        help="video file, device index or stream URL")
+    parser.add_argument("--method", default="green",
+                        choices=list(registry.METHODS))
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds of stream time per output line")
+    parser.add_argument("--output", default="-",
+                        help="'-' (stdout), tcp://host:port or unix:///path")
+    parser.add_argument("--detect-interval", type=int, default=1,
+                        help="run FaceMesh every N frames, track between")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on localhost:PORT")
+    parser.add_argument("--record", default=None,
+                        help="write a binary session recording here")
+    args = parser.parse_args()
+
+    metrics = Metrics(enabled=args.metrics_port is not None)
+    server = None
+    if args.metrics_port is not None:
+        server = MetricsServer(metrics, port=args.metrics_port).start()
+
+    sink = open_sink(args.output)
+    service = HeadlessMonitor(
+        args.source, sink, method=args.method, interval=args.interval,
+        detector_kwargs={"detect_interval": args.detect_interval},
+        metrics=metrics, record=args.record,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: service.stop())
+
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import argparse
+import csv
+import json
+import os
+import struct
+
+import numpy as np
+
+from core.trace import TRACE_DTYPE, frame_stats
+from pipeline.monitor import StreamMonitor
+
+
+SESSION_MAGIC = b"STRSESS1"
+SESSION_VERSION = 1
+
+# File: magic, u32 header length, JSON header, then chunks of records.
+# Each chunk starts with (tag, record count, first t, last t). The
+# sidecar .idx file holds one (offset, count, first t, last t) entry per
+# chunk, written after the chunk itself.
+_HEADER_LEN = struct.Struct("<I")
+_CHUNK = struct.Struct("<4sIdd")
+_INDEX = struct.Struct("<QIdd")
+_CHUNK_TAG = b"CHNK"
+
+
+def session_dtype(n_landmarks):
+    """
+    One record per frame: the trace fields (t, per-region rgb / count,
+    found) plus frame seq, face bbox, an int16 landmark subset and the
+    live HR / RMSSD / stress (NaN until known).
+    """
+    return np.dtype(TRACE_DTYPE.descr + [
+        ("seq", np.int64),
+        ("bbox", np.int32, (4,)),
+        ("landmarks", np.int16, (n_landmarks, 2)),
+        ("hr", np.float32),
+        ("rmssd", np.float32),
+        ("stress", np.float32),
+    ])
+
+
+class SessionRecorder:
+    """
+    Append-only binary recorder for a live session. Records are
+    buffered and written chunk_frames at a time; a crash loses at most
+    the unwritten buffer, and a partly written last chunk is ignored on
+    read. meta (fps, method, landmark_ids, ...) is stored in the header.
+    """
+
+    def __init__(self, path, n_landmarks, meta=None, chunk_frames=256):
+        self.path = path
+        self.dtype = session_dtype(n_landmarks)
+        self.chunk_frames = chunk_frames
+        self.frames = 0
+
+        header = dict(meta or {})
+        header["version"] = SESSION_VERSION
+        header["n_landmarks"] = n_landmarks
+        header = json.dumps(header).encode()
+
+        self._file = open(path, "wb")
+        self._file.write(SESSION_MAGIC)
+        self._file.write(_HEADER_LEN.pack(len(header)))
+        self._file.write(header)
+        self._index = open(path + ".idx", "wb")
+
+        self._buffer = np.zeros(chunk_frames, dtype=self.dtype)
+        self._blank = np.zeros((), dtype=self.dtype)
+        self._n = 0
+
+    def record(self, t, seq=0, regions=None, bbox=None, landmarks=None,
+               hr=None, rmssd=None, stress=None):
+        """
+        regions: extract_region_stats() output, or None without a face;
+        landmarks: the rows to keep, already selected by the caller.
+        """
+        self._buffer[self._n] = self._blank
+        rec = self._buffer[self._n]
+        rec["t"] = t
+        rec["seq"] = seq
+        if regions is not None:
+            rec["found"] = True
+            for i, stats in enumerate(regions):
+                rec["rgb"][i] = stats.mean
+                rec["count"][i] = stats.count
+        if bbox is not None:
+            rec["bbox"] = bbox
+        if landmarks is not None:
+            rec["landmarks"] = landmarks
+        for name, value in (("hr", hr), ("rmssd", rmssd),
+                            ("stress", stress)):
+            rec[name] = np.nan if value is None else value
+
+        self._n += 1
+        self.frames += 1
+        if self._n == self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        if self._n == 0:
+            return
+        chunk = self._buffer[:self._n]
+        offset = self._file.tell()
+        t0, t1 = float(chunk["t"][0]), float(chunk["t"][-1])
+
+        self._file.write(_CHUNK.pack(_CHUNK_TAG, self._n, t0, t1))
+        self._file.write(chunk.tobytes())
+        self._file.flush()
+        self._index.write(_INDEX.pack(offset, self._n, t0, t1))
+        self._index.flush()
+        self._n = 0
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class SessionReader:
+    """
+    Reads a SessionRecorder file. chunks lists (offset, count, first t,
+    last t); it comes from the .idx sidecar, and any chunks written after
+    the last index entry are found by walking chunk headers.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(SESSION_MAGIC)) != SESSION_MAGIC:
+                raise ValueError(f"Not a session file: {path}")
+            (length,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+            self.header = json.loads(f.read(length))
+            data_start = f.tell()
+
+        self.dtype = session_dtype(self.header["n_landmarks"])
+        self.chunks = self._scan(self._load_index(), data_start)
+
+    def __len__(self):
+        return sum(n for _, n, _, _ in self.chunks)
+
+    def read(self, t_start=None, t_end=None):
+        """All records, or those with t_start <= t <= t_end."""
+        lo = -np.inf if t_start is None else t_start
+        hi = np.inf if t_end is None else t_end
+
+        parts = []
+        with open(self.path, "rb") as f:
+            for offset, n, t0, t1 in self.chunks:
+                if t1 < lo or t0 > hi:
+                    continue
+                f.seek(offset + _CHUNK.size)
+                parts.append(np.fromfile(f, dtype=self.dtype, count=n))
+
+        if not parts:
+            return np.zeros(0, dtype=self.dtype)
+        records = np.concatenate(parts)
+        return records[(records["t"] >= lo) & (records["t"] <= hi)]
+
+    def _load_index(self):
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                raw = f.read()
+        except OSError:
+            return []
+        usable = len(raw) - len(raw) % _INDEX.size
+        return [_INDEX.unpack_from(raw, i)
+                for i in range(0, usable, _INDEX.size)]
+
+    def _scan(self, chunks, data_start):
+        size = os.path.getsize(self.path)
+        payload = self.dtype.itemsize
+        chunks = [c for c in chunks
+                  if c[0] + _CHUNK.size + c[1] * payload <= size]
+
+        offset = data_start
+        if chunks:
+            offset = chunks[-1][0] + _CHUNK.size + chunks[-1][1] * payload
+
+        with open(self.path, "rb") as f:
+            while offset + _CHUNK.size <= size:
+                f.seek(offset)
+                tag, n, t0, t1 = _CHUNK.unpack(f.read(_CHUNK.size))
+                end = offset + _CHUNK.size + n * payload
+                if tag != _CHUNK_TAG or end > size:
+                    break
+                chunks.append((offset, n, t0, t1))
+                offset = end
+        return chunks
+
+
+# ---------------- REPLAY ---------------- #
+
+REPLAY_DTYPE = np.dtype([
+    ("t", np.float64),
+    ("hr", np.float32),
+    ("rmssd", np.float32),
+    ("stress", np.float32),
+])
+
+
+def replay(records, fps, method="green", history=60):
+    """
+    Feed recorded ROI means through a fresh StreamMonitor as fast as it
+    runs, skipping capture, FaceMesh and ROI extraction. Returns one
+    REPLAY_DTYPE row per beat.
+    """
+    monitor = StreamMonitor(fps, method=method, history=history)
+    beats = []
+    for rec in records:
+        if monitor.update(frame_stats(rec), float(rec["t"])):
+            beats.append((rec["t"], monitor.hr, monitor.rmssd,
+                          monitor.stress))
+    return np.array(beats, dtype=REPLAY_DTYPE)
+
+
+# ---------------- REPORT ---------------- #
+
+
+def session_report(records):
+    """Summary dict of a session's recorded HR / RMSSD / stress."""
+    report = {
+        "frames": int(len(records)),
+        "duration_s": 0.0,
+        "face_fraction": 0.0,
+    }
+    if len(records) == 0:
+        return report
+
+    report["duration_s"] = float(records["t"][-1] - records["t"][0])
+    report["face_fraction"] = float(records["found"].mean())
+
+    for name in ("hr", "rmssd", "stress"):
+        values = records[name][np.isfinite(records[name])]
+        if len(values) == 0:
+            report[name] = None
+            continue
+        report[name] = {
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "p90": float(np.percentile(values, 90)),
+        }
+    return report
+
+
+def export_report(reader, out_dir, interval=1.0):
+    """
+    Write report.json (session_report plus the header) and timeline.csv
+    (one row per `interval` seconds: the last known HR / RMSSD / stress
+    and the fraction of frames with a face) into out_dir.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    records = reader.read()
+
+    report = {"session": reader.header, **session_report(records)}
+    with open(os.path.join(out_dir, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    with open(os.path.join(out_dir, "timeline.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["t", "hr", "rmssd", "stress", "quality"])
+        if len(records):
+            t = records["t"] - records["t"][0]
+            bins = (t // interval).astype(np.int64)
+            ends = np.flatnonzero(np.diff(bins)) + 1
+            for chunk in np.split(records, ends):
+                row = [round(float(chunk["t"][-1] - records["t"][0]), 3)]
+                for name in ("hr", "rmssd", "stress"):
+                    known = chunk[name][np.isfinite(chunk[name])]
+                    row.append(
+                        round(float(known[-1]), 3) if len(known) else ""
+                    )
+                row.append(round(float(chunk["found"].mean()), 3))
+                writer.writerow(row)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay or report on a recorded session"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("replay", help="recompute HR / stress per beat")
+    p.add_argument("session")
+    p.add_argument("--method", default=None,
+                   help="rPPG method (default: the recorded one)")
+
+    p = sub.add_parser("report", help="write report.json and timeline.csv")
+    p.add_argument("session")
+    p.add_argument("--out", default=".")
+    args = parser.parse_args()
+
+    reader = SessionReader(args.session)
+    if args.command == "replay":
+        method = args.method or reader.header.get("method", "green")
+        beats = replay(reader.read(), reader.header["fps"], method)
+        for row in beats:
+            print(json.dumps({name: float(row[name])
+                              for name in REPLAY_DTYPE.names}))
+    else:
+        report = export_report(reader, args.out)
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Projection window length in seconds (Wang et al. use 1.6 s for POS)
+WINDOW = 1.6
+
+
+def window_length(fps, window=WINDOW):
+    return max(2, int(round(window * fps)))
+
+
+def temporal_normalise(windows):
+    """Divide each window (..., L, 3) by its per-channel temporal mean."""
+    return windows / (windows.mean(axis=-2, keepdims=True) + 1e-9)
+
+
+def overlap_add(h, n):
+    """
+    Sum stride-1 windows h (n_windows, L) into a length-n signal, each
+    window mean-removed first. Loops over the L offsets, never frames.
+    """
+    h = h - h.mean(axis=1, keepdims=True)
+    n_windows, length = h.shape
+    out = np.zeros(n)
+    for j in range(length):
+        out[j:j + n_windows] += h[:, j]
+    return out
+
+
+def process(rgb_trace, fps, project, window=WINDOW):
+    """
+    Batch rPPG over a whole (N, 3) trace of (B, G, R) skin means: every
+    stride-1 window is normalised and projected at once by `project`
+    ((n_windows, L, 3) -> (n_windows, L)), then overlap-added. Returns
+    an empty array when the trace is shorter than one window.
+    """
+    rgb = np.asarray(rgb_trace, dtype=np.float64)
+    length = window_length(fps, window)
+    if len(rgb) < length:
+        return np.zeros(0)
+
+    windows = sliding_window_view(rgb, length, axis=0).transpose(0, 2, 1)
+    return overlap_add(project(temporal_normalise(windows)), len(rgb))
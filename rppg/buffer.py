@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity signal store with running per-channel statistics.
+
+    Every sample is written twice (at i and i + capacity) so the most
+    recent window is always a contiguous slice and view() never copies.
+    Views alias the storage: they are only valid until the next append.
+    """
+
+    def __init__(self, capacity, channels=None):
+        self.capacity = int(capacity)
+        self.channels = channels
+
+        shape = (2 * self.capacity,)
+        if channels is not None:
+            shape += (channels,)
+        self._data = np.zeros(shape, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._since_resync = 0
+
+        stat_shape = () if channels is None else (channels,)
+        self._sum = np.zeros(stat_shape)
+        self._sumsq = np.zeros(stat_shape)
+
+    def __len__(self):
+        return self._count
+
+    def append(self, sample):
+        sample = np.asarray(sample, dtype=np.float64)
+
+        if self._count == self.capacity:
+            evicted = self._data[self._head]
+            self._sum -= evicted
+            self._sumsq -= evicted * evicted
+        else:
+            self._count += 1
+
+        self._data[self._head] = sample
+        self._data[self._head + self.capacity] = sample
+        self._head = (self._head + 1) % self.capacity
+
+        self._sum += sample
+        self._sumsq += sample * sample
+
+        # Running sums drift over long sessions; resync once per lap
+        self._since_resync += 1
+        if self._since_resync >= self.capacity:
+            self._resync()
+
+    def view(self):
+        end = self._head + self.capacity
+        return self._data[end - self._count:end]
+
+    def last(self):
+        if self._count == 0:
+            return None
+        return self._data[self._head + self.capacity - 1]
+
+    def mean(self):
+        if self._count == 0:
+            return None
+        return self._sum / self._count
+
+    def std(self):
+        if self._count == 0:
+            return None
+        mean = self._sum / self._count
+        var = np.maximum(self._sumsq / self._count - mean * mean, 0.0)
+        return np.sqrt(var)
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+        self._since_resync = 0
+        self._sum[...] = 0.0
+        self._sumsq[...] = 0.0
+
+    def _resync(self):
+        window = self.view()
+        # Assign in place so 0-d stats stay arrays (clear() relies on it)
+        self._sum[...] = window.sum(axis=0)
+        self._sumsq[...] = (window * window).sum(axis=0)
+        self._since_resync = 0
@@ -1,28 +1,49 @@
-import numpy as np
+from core.roi import channel_means
+from rppg import batch
+from rppg.buffer import RingBuffer
 
 
 class ChromRPPG:
-    def __init__(self):
-        self.buffer = []
-
-    def update(self, roi_pixels):
-        if roi_pixels is None or len(roi_pixels) < 50:
+    def __init__(self, fps, buffer_size=300):
+        self.fps = fps
+        # Channels are the CHROM projections X = 3R - 2G, Y = 1.5R + G - 1.5B
+        self.buffer = RingBuffer(buffer_size, channels=2)
+
+    def update(self, roi):
+        means = channel_means(roi)
+        if means is None:
             return None
 
-        r = np.mean(roi_pixels[:, 2])
-        g = np.mean(roi_pixels[:, 1])
-        b = np.mean(roi_pixels[:, 0])
-
-        self.buffer.append([r, g, b])
-        rgb = np.array(self.buffer)
+        b, g, r = means
+        self.buffer.append((3 * r - 2 * g, 1.5 * r + g - 1.5 * b))
 
-        if len(rgb) < 30:
+        if len(self.buffer) < 30:
             return None
 
-        X = 3 * rgb[:, 0] - 2 * rgb[:, 1]
-        Y = 1.5 * rgb[:, 0] + rgb[:, 1] - 1.5 * rgb[:, 2]
+        # Only the newest sample is normalised here (O(1) per frame);
+        # window() builds the whole normalised window on demand
+        return self._normalise(self.buffer.view()[-1:])
 
-        X /= np.std(X) + 1e-6
-        Y /= np.std(Y) + 1e-6
-
-        return X - Y
+    def window(self):
+        if len(self.buffer) < 30:
+            return None
+        return self._normalise(self.buffer.view())
+
+    def _normalise(self, xy):
+        std_x, std_y = self.buffer.std()
+        return xy[:, 0] / (std_x + 1e-6) - xy[:, 1] / (std_y + 1e-6)
+
+    @staticmethod
+    def project(cn):
+        b, g, r = cn[..., 0], cn[..., 1], cn[..., 2]
+        x = 3 * r - 2 * g
+        y = 1.5 * r + g - 1.5 * b
+        alpha = x.std(axis=-1, keepdims=True) / (
+            y.std(axis=-1, keepdims=True) + 1e-9
+        )
+        return x - alpha * y
+
+    @classmethod
+    def process(cls, rgb_trace, fps):
+        """de Haan & Jeanne CHROM with windowed overlap-add."""
+        return batch.process(rgb_trace, fps, cls.project)
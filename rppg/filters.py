@@ -1,11 +1,78 @@
+from collections import deque
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, filtfilt, sosfilt, sosfilt_zi, sosfiltfilt
+
+
+@lru_cache(maxsize=32)
+def _design_ba(fps, low, high, order):
+    nyq = 0.5 * fps
+    return butter(order, [low / nyq, high / nyq], btype="band")
+
+
+@lru_cache(maxsize=32)
+def _design_sos(fps, low, high, order):
+    nyq = 0.5 * fps
+    sos = butter(order, [low / nyq, high / nyq], btype="band", output="sos")
+    return sos, sosfilt_zi(sos)
 
 
 def bandpass(signal, fps, low=0.7, high=3.0, order=3):
     if len(signal) < fps * 2:
         return signal
 
-    nyq = 0.5 * fps
-    b, a = butter(order, [low / nyq, high / nyq], btype="band")
+    b, a = _design_ba(fps, low, high, order)
     return filtfilt(b, a, signal)
+
+
+class StreamingBandpass:
+    """
+    Causal Butterworth band-pass that keeps its filter state between
+    calls, so each new sample costs O(order) instead of refiltering the
+    whole history. The last `window` raw samples are retained for an
+    optional zero-phase refinement of the recent window.
+    """
+
+    def __init__(self, fps, low=0.7, high=3.0, order=3, window=240):
+        self.fps = fps
+        self.sos, self._zi_unit = _design_sos(fps, low, high, order)
+        self.zi = None
+        self.raw = deque(maxlen=window)
+        self.filtered = deque(maxlen=window)
+
+    def process(self, samples):
+        """
+        Filter new samples and return their filtered values.
+        """
+        samples = np.atleast_1d(np.asarray(samples, dtype=np.float64))
+        if samples.size == 0:
+            return samples
+
+        if self.zi is None:
+            # Start in steady state for the first sample to avoid a step
+            self.zi = self._zi_unit * samples[0]
+
+        out, self.zi = sosfilt(self.sos, samples, zi=self.zi)
+
+        self.raw.extend(samples)
+        self.filtered.extend(out)
+        return out
+
+    def window(self):
+        return np.array(self.filtered)
+
+    def refined(self):
+        """
+        Zero-phase (forward-backward) filter over the retained raw
+        window. Matches bandpass() away from the window edges.
+        """
+        raw = np.array(self.raw)
+        if len(raw) < self.fps * 2:
+            return raw
+        return sosfiltfilt(self.sos, raw)
+
+    def reset(self):
+        self.zi = None
+        self.raw.clear()
+        self.filtered.clear()
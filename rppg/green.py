@@ -1,16 +1,27 @@
-import numpy as np
+from core.roi import channel_means
+from rppg import batch
+from rppg.buffer import RingBuffer
 
 
 class GreenRPPG:
     def __init__(self, fps, buffer_size=300):
         self.fps = fps
-        self.buffer = []
+        self.buffer = RingBuffer(buffer_size)
 
-    def update(self, roi_pixels):
-        if roi_pixels is None or len(roi_pixels) < 50:
+    def update(self, roi):
+        means = channel_means(roi)
+        if means is None:
             return None
 
-        g_mean = np.mean(roi_pixels[:, 1])
-        self.buffer.append(g_mean)
+        self.buffer.append(means[1])
 
-        return np.array(self.buffer)
+        return self.buffer.view()
+
+    @staticmethod
+    def project(cn):
+        return cn[..., 1]
+
+    @classmethod
+    def process(cls, rgb_trace, fps):
+        """Windowed, mean-normalised green channel over a whole trace."""
+        return batch.process(rgb_trace, fps, cls.project)
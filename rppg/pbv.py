@@ -0,0 +1,48 @@
+import numpy as np
+
+from core.roi import channel_means
+from rppg import batch
+from rppg.buffer import RingBuffer
+
+
+class PBVRPPG:
+    """
+    Blood-volume-pulse signature method (de Haan & van Leest 2014): the
+    pulse is the projection whose weights w solve Q w = pbv, with Q the
+    windowed colour covariance and pbv the normalised per-channel pulse
+    strength. Same update() / process() interface as POSRPPG.
+    """
+
+    def __init__(self, fps, window=batch.WINDOW):
+        self.fps = fps
+        self.buffer = RingBuffer(batch.window_length(fps, window), channels=3)
+
+    def update(self, roi):
+        means = channel_means(roi)
+        if means is None:
+            return None
+
+        self.buffer.append(means)
+        if len(self.buffer) < self.buffer.capacity:
+            return None
+
+        cn = self.buffer.view() / (self.buffer.mean() + 1e-9)
+        h = self.project(cn[None])[0]
+        return h - h.mean()
+
+    @staticmethod
+    def project(cn):
+        c = cn - cn.mean(axis=-2, keepdims=True)
+        pbv = c.std(axis=-2)
+        pbv /= np.linalg.norm(pbv, axis=-1, keepdims=True) + 1e-9
+
+        q = np.einsum("...lc,...ld->...cd", c, c)
+        q += 1e-9 * np.eye(3)
+        w = np.linalg.solve(q, pbv[..., None])[..., 0]
+        # Scale so that pbv . w = 1
+        w /= np.einsum("...c,...c->...", pbv, w)[..., None] + 1e-12
+        return np.einsum("...lc,...c->...l", c, w)
+
+    @classmethod
+    def process(cls, rgb_trace, fps):
+        return batch.process(rgb_trace, fps, cls.project)
@@ -0,0 +1,42 @@
+from core.roi import channel_means
+from rppg import batch
+from rppg.buffer import RingBuffer
+
+
+class POSRPPG:
+    """
+    Plane-Orthogonal-to-Skin (Wang et al. 2017). update() projects the
+    latest window and returns it (newest sample last); process() runs
+    the whole trace with overlap-add.
+    """
+
+    def __init__(self, fps, window=batch.WINDOW):
+        self.fps = fps
+        self.buffer = RingBuffer(batch.window_length(fps, window), channels=3)
+
+    def update(self, roi):
+        means = channel_means(roi)
+        if means is None:
+            return None
+
+        self.buffer.append(means)
+        if len(self.buffer) < self.buffer.capacity:
+            return None
+
+        cn = self.buffer.view() / (self.buffer.mean() + 1e-9)
+        h = self.project(cn[None])[0]
+        return h - h.mean()
+
+    @staticmethod
+    def project(cn):
+        b, g, r = cn[..., 0], cn[..., 1], cn[..., 2]
+        s1 = g - b
+        s2 = g + b - 2 * r
+        alpha = s1.std(axis=-1, keepdims=True) / (
+            s2.std(axis=-1, keepdims=True) + 1e-9
+        )
+        return s1 + alpha * s2
+
+    @classmethod
+    def process(cls, rgb_trace, fps):
+        return batch.process(rgb_trace, fps, cls.project)
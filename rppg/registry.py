@@ -0,0 +1,31 @@
+from rppg.chrom import ChromRPPG
+from rppg.green import GreenRPPG
+from rppg.pbv import PBVRPPG
+from rppg.pos import POSRPPG
+
+
+# name -> class with update(roi), a RingBuffer `buffer` of pending
+# samples and classmethod process(rgb_trace, fps)
+METHODS = {
+    "green": GreenRPPG,
+    "chrom": ChromRPPG,
+    "pos": POSRPPG,
+    "pbv": PBVRPPG,
+}
+
+
+def register(name, cls):
+    METHODS[name] = cls
+    return cls
+
+
+def get_method(name):
+    try:
+        return METHODS[name]
+    except KeyError:
+        raise ValueError(f"Unknown rPPG method: {name}") from None
+
+
+def create(name, fps):
+    """A streaming instance of the named method."""
+    return get_method(name)(fps)
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def resample(t, values, fs, max_gap=None):
+    """
+    Linearly interpolate samples taken at times t (seconds, increasing)
+    onto a uniform fs grid starting at t[0]. values may be (N,) or
+    (N, C). Grid points inside a gap longer than max_gap seconds are
+    dropped, so the output grid has holes there instead of a ramp.
+    Returns (grid times, values on the grid).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(t) == 0:
+        return t, values
+
+    n = int(np.floor((t[-1] - t[0]) * fs + 1e-9)) + 1
+    grid = t[0] + np.arange(n) / fs
+
+    if values.ndim == 1:
+        out = np.interp(grid, t, values)
+    else:
+        out = np.stack(
+            [np.interp(grid, t, values[:, c]) for c in range(values.shape[1])],
+            axis=1,
+        )
+
+    if max_gap is not None:
+        right = np.searchsorted(t, grid, side="left")
+        left = np.maximum(right - 1, 0)
+        right = np.minimum(right, len(t) - 1)
+        keep = (t[right] - t[left] <= max_gap) | (t[right] == grid)
+        grid, out = grid[keep], out[keep]
+    return grid, out
+
+
+class StreamingResampler:
+    """
+    Online counterpart of resample(): push() one timestamped sample at a
+    time and get back the uniform-grid samples (times, values) that it
+    completes. Out-of-order samples are ignored. After a gap longer than
+    max_gap seconds the grid restarts at the new sample instead of
+    bridging it, and `restarted` is True until the next push().
+    """
+
+    def __init__(self, fs, max_gap=1.0):
+        self.fs = fs
+        self.max_gap = max_gap
+        self.restarted = False
+
+        self._origin = None
+        self._k = 0          # index of the next grid point to emit
+        self._prev_t = None
+        self._prev = None
+
+    def push(self, t, value):
+        value = np.asarray(value, dtype=np.float64)
+        self.restarted = False
+
+        if self._prev_t is not None and t <= self._prev_t:
+            return np.zeros(0), value[None][:0]
+
+        if self._prev_t is None or t - self._prev_t > self.max_gap:
+            self.restarted = self._prev_t is not None
+            self._origin = t
+            self._k = 1
+            self._prev_t, self._prev = t, value
+            return np.array([t]), value[None].copy()
+
+        last = int(np.floor((t - self._origin) * self.fs + 1e-9))
+        times = self._origin + np.arange(self._k, last + 1) / self.fs
+        self._k = last + 1
+
+        frac = (times - self._prev_t) / (t - self._prev_t)
+        frac = frac.reshape((-1,) + (1,) * value.ndim)
+        out = self._prev + frac * (value - self._prev)
+
+        self._prev_t, self._prev = t, value
+        return times, out
+
+    def reset(self):
+        self._origin = None
+        self._prev_t = None
+        self._prev = None
+        self.restarted = False
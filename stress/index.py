@@ -1,3 +1,5 @@
+from collections import deque
+
 import numpy as np
 
 def normalize(x, xmin, xmax):
@@ -36,3 +38,117 @@ def compute_stress_index(hr, rmssd, hr_history):
         stress *= 0.6
 
     return np.clip(100.0 * stress, 0, 100)
+
+
+# ---------------- BATCH ---------------- #
+
+def stress_series(hr, rmssd, history=60):
+    """
+    compute_stress_index() for every sample of an HR / RMSSD recording,
+    as if each HR were appended to a deque(maxlen=history) and scored
+    against it. Returns an array the length of hr.
+    """
+    hr = np.asarray(hr, dtype=np.float64)
+    rmssd = np.asarray(rmssd, dtype=np.float64)
+    n = len(hr)
+    k = np.arange(n)
+    length = np.minimum(k + 1, history)
+
+    # --- Relative HR: baseline is the history minus the current sample ---
+    baseline = np.zeros(n)
+    warmup = min(n, history)
+    for i in range(9, warmup):
+        baseline[i] = np.mean(hr[:i])
+    if n > history - 1 and history > 1:
+        prev = np.lib.stride_tricks.sliding_window_view(hr, history - 1)
+        baseline[history - 1:] = prev[:n - history + 1].mean(axis=1)
+    hr_n = np.where(
+        length >= 10, normalize(hr - baseline, -12, 18), 0.4
+    )
+
+    rmssd_n = normalize(rmssd, 15, 80)
+
+    # --- Slope over the last five samples ---
+    slope = np.zeros(n)
+    if n >= 5:
+        d = np.diff(hr)
+        slope[4:] = ((d[:-3] + d[1:-2]) + d[2:-1] + d[3:]) / 4
+    slope = np.where(length >= 5, slope, 0.0)
+    slope_n = normalize(slope, -3, 6)
+
+    parasymp_factor = 1.0 - rmssd_n
+    stress = (
+        0.25 * hr_n +
+        0.35 * parasymp_factor +
+        0.15 * slope_n
+    )
+    stress = np.where(rmssd_n > 0.65, stress * 0.6, stress)
+    return np.clip(100.0 * stress, 0, 100)
+
+
+# ---------------- INCREMENTAL ---------------- #
+
+class StressScorer:
+    """
+    Streaming compute_stress_index(): update(hr, rmssd) appends hr to an
+    internal history of `history` samples and scores it in O(1). The
+    baseline is a compensated running sum, so it tracks np.mean to
+    floating-point rounding without drifting over long sessions.
+    """
+
+    def __init__(self, history=60):
+        self.history = history
+        self.hr = deque(maxlen=history)
+        self._sum = 0.0
+        self._comp = 0.0
+
+    def update(self, hr, rmssd):
+        # The baseline excludes the newest sample: add the previous one
+        # and drop whichever sample is leaving the baseline window
+        if self.hr:
+            self._add(self.hr[-1])
+            if len(self.hr) == self.history:
+                self._add(-self.hr[0])
+        self.hr.append(hr)
+        h = self.hr
+        n = len(h)
+
+        if n >= 10:
+            baseline_hr = (self._sum + self._comp) / (n - 1)
+            hr_n = normalize(hr - baseline_hr, -12, 18)
+        else:
+            hr_n = 0.4
+
+        rmssd_n = normalize(rmssd, 15, 80)
+
+        if n >= 5:
+            slope = ((((h[-4] - h[-5]) + (h[-3] - h[-4]))
+                      + (h[-2] - h[-3])) + (h[-1] - h[-2])) / 4
+        else:
+            slope = 0.0
+        slope_n = normalize(slope, -3, 6)
+
+        parasymp_factor = 1.0 - rmssd_n
+        stress = (
+            0.25 * hr_n +
+            0.35 * parasymp_factor +
+            0.15 * slope_n
+        )
+        if rmssd_n > 0.65:
+            stress *= 0.6
+
+        return np.clip(100.0 * stress, 0, 100)
+
+    def reset(self):
+        self.hr.clear()
+        self._sum = 0.0
+        self._comp = 0.0
+
+    def _add(self, x):
+        # Neumaier summation
+        t = self._sum + x
+        if abs(self._sum) >= abs(x):
+            self._comp += (self._sum - t) + x
+        else:
+            self._comp += (x - t) + self._sum
+        self._sum = t
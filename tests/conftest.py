@@ -0,0 +1,23 @@
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def make_clip(tmp_path):
+    """Writes a small MJPG clip of flat grey frames and returns its path."""
+
+    def write(n_frames=20, size=(64, 48), fps=30, name="clip.avi"):
+        path = tmp_path / name
+        writer = cv2.VideoWriter(
+            str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, size
+        )
+        for i in range(n_frames):
+            frame = np.full(
+                (size[1], size[0], 3), i * 10 % 255, dtype=np.uint8
+            )
+            writer.write(frame)
+        writer.release()
+        return str(path)
+
+    return write
@@ -0,0 +1,46 @@
+import numpy as np
+
+from bench import (
+    build_benchmarks, compare, measure, synthetic_frame, synthetic_landmarks,
+    synthetic_pulse,
+)
+
+
+def test_synthetic_inputs_are_deterministic():
+    np.testing.assert_array_equal(
+        synthetic_frame((64, 48)), synthetic_frame((64, 48))
+    )
+    lm = synthetic_landmarks((640, 480))
+    assert lm.shape == (468, 2)
+    assert lm.min() >= 0 and lm[:, 0].max() < 640 and lm[:, 1].max() < 480
+
+
+def test_synthetic_pulse_has_requested_hr():
+    fps = 30
+    pulse = synthetic_pulse(84, fps, 20)
+    freqs = np.fft.rfftfreq(len(pulse), 1 / fps)
+    peak = freqs[np.argmax(np.abs(np.fft.rfft(pulse)))]
+    assert abs(peak * 60 - 84) < 3
+
+
+def test_measure_reports_percentiles_and_allocations():
+    result = measure(lambda: np.zeros(1024), repeat=20, warmup=1)
+
+    assert result["calls"] == 20
+    assert result["p50_us"] <= result["p90_us"] <= result["p99_us"]
+    assert result["p99_us"] <= result["max_us"]
+    assert result["peak_alloc_kib"] >= 8    # one 8 KiB array
+
+
+def test_signal_stage_benchmarks_run_offline():
+    benches = build_benchmarks()
+    for name in ("green.update", "chrom.update", "hrv.lf_hf",
+                 "stress.compute_stress_index"):
+        assert measure(benches[name](), repeat=3, warmup=1)["p50_us"] > 0
+
+
+def test_compare_gives_latency_ratio():
+    baseline = {"a": {"p50_us": 10.0}, "b": {"p50_us": 4.0}}
+    current = {"a": {"p50_us": 5.0}, "c": {"p50_us": 1.0}}
+
+    assert compare(baseline, current) == {"a": 0.5}
@@ -0,0 +1,90 @@
+import csv
+import json
+
+import numpy as np
+
+from eval_batch import FIELDS, evaluate_entry, load_manifest, write_results
+
+
+def test_load_manifest_csv_resolves_relative_paths(tmp_path):
+    (tmp_path / "data").mkdir()
+    manifest = tmp_path / "data" / "manifest.csv"
+    manifest.write_text(
+        "video,ground_truth,fs\n"
+        "a.avi,a.txt,64\n"
+        "/abs/b.avi,/abs/b.txt,256\n"
+    )
+
+    entries = load_manifest(str(manifest))
+
+    assert entries[0] == {
+        "video": str(tmp_path / "data" / "a.avi"),
+        "ground_truth": str(tmp_path / "data" / "a.txt"),
+        "fs": 64.0,
+    }
+    assert entries[1]["video"] == "/abs/b.avi"
+    assert entries[1]["fs"] == 256.0
+
+
+def test_load_manifest_json(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([
+        {"video": "v.avi", "ground_truth": "gt.txt", "fs": "64"},
+    ]))
+
+    (entry,) = load_manifest(str(manifest))
+
+    assert entry["video"] == str(tmp_path / "v.avi")
+    assert entry["fs"] == 64.0
+
+
+def test_evaluate_entry_reports_errors_per_method(tmp_path):
+    entry = {
+        "video": str(tmp_path / "missing.avi"),
+        "ground_truth": str(tmp_path / "missing.txt"),
+        "fs": 64.0,
+    }
+
+    rows = evaluate_entry(entry, ["green", "chrom"])
+
+    assert [r["method"] for r in rows] == ["green", "chrom"]
+    for row in rows:
+        assert row["error"]
+        assert "\n" not in row["error"]
+        assert row["mae"] is None
+
+
+def test_evaluate_entry_without_face_scores_nan(tmp_path, make_clip):
+    np.savetxt(tmp_path / "gt.txt", np.sin(np.arange(640) / 64 * 7.5))
+    entry = {
+        "video": make_clip(n_frames=10),
+        "ground_truth": str(tmp_path / "gt.txt"),
+        "fs": 64.0,
+    }
+
+    (row,) = evaluate_entry(entry, ["green"])
+
+    assert row["error"] == ""
+    assert row["rppg_samples"] == 0
+    assert np.isnan(row["mae"])
+
+
+def test_write_results_json_and_csv(tmp_path):
+    rows = [
+        {"video": "a.avi", "method": "green", "mae": float("nan"),
+         "corr": 0.5, "error": ""},
+        dict(dict.fromkeys(FIELDS), video="b.avi", method="chrom",
+             error="RuntimeError: boom"),
+    ]
+
+    write_results(rows, str(tmp_path / "out.json"))
+    loaded = json.loads((tmp_path / "out.json").read_text())
+    assert loaded[0]["mae"] is None
+    assert loaded[1]["corr"] is None
+
+    write_results(rows, str(tmp_path / "out.csv"))
+    with open(tmp_path / "out.csv", newline="") as f:
+        table = list(csv.DictReader(f))
+    assert list(table[0]) == FIELDS
+    assert table[1]["error"] == "RuntimeError: boom"
+    assert table[1]["mae"] == ""
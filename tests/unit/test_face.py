@@ -1,5 +1,9 @@
+from types import SimpleNamespace
+
 import cv2
-from core.face import FaceLandmarkDetector
+import numpy as np
+
+from core.face import LANDMARK_REGIONS, FaceLandmarkDetector
 
 def test_face_landmarks_detected():
     detector = FaceLandmarkDetector()
@@ -9,3 +13,162 @@ def test_face_landmarks_detected():
     assert landmarks is not None
     assert landmarks.shape[0] == 468
     assert bbox is not None
+
+
+class _FakeMesh:
+    """Stands in for FaceMesh: always reports the same normalised mesh."""
+
+    def __init__(self, points):
+        self.calls = 0
+        self.sizes = []
+        face = SimpleNamespace(
+            landmark=[SimpleNamespace(x=x, y=y) for x, y in points]
+        )
+        self.result = SimpleNamespace(multi_face_landmarks=[face])
+
+    def process(self, rgb):
+        self.calls += 1
+        self.sizes.append(rgb.shape[:2])
+        return self.result
+
+
+def _textured_frame(shift=(0, 0)):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 255, (240, 320), dtype=np.uint8)
+    img = cv2.GaussianBlur(img, (0, 0), 4)
+    img = np.roll(img, shift=(shift[1], shift[0]), axis=(0, 1))
+    return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+
+def test_landmarks_tracked_between_detections():
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0.3, 0.7, size=(468, 2))
+
+    detector = FaceLandmarkDetector(detect_interval=4, motion_threshold=1.0)
+    detector.detector = _FakeMesh(points)
+    detector.alpha = 0.0
+
+    first, _ = detector.process(_textured_frame())
+    assert detector.detected and not detector.tracked
+
+    second, _ = detector.process(_textured_frame(shift=(5, 4)))
+    assert detector.tracked and not detector.detected
+    assert detector.detector.calls == 1
+
+    np.testing.assert_allclose(
+        (second - first).mean(axis=0), (5.0, 4.0), atol=1.0
+    )
+
+    for _ in range(2):
+        detector.process(_textured_frame(shift=(5, 4)))
+    assert detector.detector.calls == 1
+    detector.process(_textured_frame(shift=(5, 4)))
+    assert detector.detector.calls == 2
+
+
+def test_fast_motion_shortens_detect_interval():
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0.3, 0.7, size=(468, 2))
+
+    detector = FaceLandmarkDetector(detect_interval=8, motion_threshold=0.02)
+    detector.detector = _FakeMesh(points)
+
+    detector.process(_textured_frame())
+    detector.process(_textured_frame(shift=(8, 6)))
+
+    assert detector.tracked
+    assert detector.motion > 0.02
+    assert detector.interval < 8
+
+
+def test_landmark_subset_conversion():
+    rng = np.random.default_rng(2)
+    points = rng.uniform(0.1, 0.9, size=(468, 2))
+    frame = _textured_frame()
+    h, w, _ = frame.shape
+
+    full = FaceLandmarkDetector()
+    full.detector = _FakeMesh(points)
+    subset = FaceLandmarkDetector(regions=["left_eye", "mouth"])
+    subset.detector = _FakeMesh(points)
+
+    full_lm, _ = full.process(frame)
+    sub_lm, _ = subset.process(frame)
+
+    expected = np.array([(int(x * w), int(y * h)) for x, y in points])
+    np.testing.assert_array_equal(full_lm, expected)
+
+    for name in ["left_eye", "mouth"]:
+        np.testing.assert_array_equal(
+            sub_lm[subset.regions[name]],
+            expected[LANDMARK_REGIONS[name]]
+        )
+    assert len(sub_lm) == len(
+        set(LANDMARK_REGIONS["left_eye"]) | set(LANDMARK_REGIONS["mouth"])
+    )
+
+
+def test_velocity_spans_detections_in_the_reused_buffer():
+    rng = np.random.default_rng(3)
+    points = rng.uniform(0.3, 0.7, size=(468, 2))
+    frame = _textured_frame()
+
+    detector = FaceLandmarkDetector(
+        detect_interval=2, tracker="velocity", motion_threshold=1.0
+    )
+    detector.detector = _FakeMesh(points)
+
+    detector.process(frame)    # detect
+    detector.process(frame)    # track
+    for lm in detector.detector.result.multi_face_landmarks[0].landmark:
+        lm.x += 16 / 320
+        lm.y += 12 / 240
+    detector.process(frame)    # detect again, into the same buffer
+
+    assert detector.detected
+    np.testing.assert_allclose(
+        detector._velocity.mean(axis=0), (16.0, 12.0), atol=1.0
+    )
+
+
+def test_detect_all_returns_every_face_statelessly():
+    rng = np.random.default_rng(2)
+    points = rng.uniform(0.2, 0.4, size=(468, 2))
+    mesh = _FakeMesh(points)
+    second = SimpleNamespace(landmark=[
+        SimpleNamespace(x=x + 0.4, y=y) for x, y in points
+    ])
+    mesh.result.multi_face_landmarks.append(second)
+
+    detector = FaceLandmarkDetector(max_faces=2, regions=["forehead"])
+    detector.detector = mesh
+
+    faces = detector.detect_all(_textured_frame())
+
+    assert len(faces) == 2
+    (lm_a, box_a), (lm_b, box_b) = faces
+    assert lm_a.dtype == np.int32 and len(lm_a) == len(detector.indices)
+    assert box_b[0] > box_a[2]
+    assert detector.prev_landmarks is None
+
+
+def test_detection_downscales_to_observed_face_size():
+    rng = np.random.default_rng(3)
+    points = rng.uniform(0.1, 0.9, size=(468, 2))
+    frame = cv2.resize(_textured_frame(), (1280, 960))
+
+    detector = FaceLandmarkDetector(min_face_size=160)
+    detector.detector = _FakeMesh(points)
+    detector.alpha = 0.0
+
+    first, _ = detector.process(frame)
+    second, _ = detector.process(frame)
+
+    # ~1000 px face -> factor 6, capped at max_downscale
+    assert detector.detector.sizes == [(960, 1280), (240, 320)]
+    assert detector.downscale == 4
+    np.testing.assert_array_equal(first, second)
+
+    detector.detector.result.multi_face_landmarks = []
+    detector.process(frame)
+    assert detector.downscale == 1
@@ -0,0 +1,53 @@
+import numpy as np
+from scipy.signal import sosfilt
+
+from rppg.filters import StreamingBandpass, bandpass
+
+FPS = 30
+
+
+def _pulse(seconds=20, hr_hz=1.2, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * FPS)) / FPS
+    return 120.0 + np.sin(2 * np.pi * hr_hz * t) + 0.2 * rng.normal(size=t.size)
+
+
+def test_streaming_chunks_match_one_shot_filter():
+    x = _pulse()
+    stream = StreamingBandpass(FPS, window=len(x))
+
+    chunks = [stream.process(c) for c in np.array_split(x, 37)]
+    streamed = np.concatenate(chunks)
+
+    expected, _ = sosfilt(stream.sos, x, zi=stream._zi_unit * x[0])
+    np.testing.assert_allclose(streamed, expected, atol=1e-9)
+
+
+def test_refined_window_matches_batch_bandpass():
+    x = _pulse()
+    stream = StreamingBandpass(FPS, window=240)
+    for v in x:
+        stream.process(v)
+
+    refined = stream.refined()
+    batch = bandpass(x[-240:], FPS)
+
+    core = slice(60, 180)
+    np.testing.assert_allclose(refined[core], batch[core], atol=0.05)
+
+
+def test_streaming_steady_state_matches_batch_spectrum():
+    x = _pulse(seconds=40)
+    stream = StreamingBandpass(FPS, window=600)
+    for v in x:
+        stream.process(v)
+
+    causal = stream.window()
+    batch = bandpass(x, FPS)[-600:]
+
+    freqs = np.fft.rfftfreq(600, 1 / FPS)
+    peak_causal = freqs[np.argmax(np.abs(np.fft.rfft(causal)))]
+    peak_batch = freqs[np.argmax(np.abs(np.fft.rfft(batch)))]
+
+    assert peak_causal == peak_batch
+    assert abs(np.std(causal) / np.std(batch) - 1.0) < 0.05
@@ -0,0 +1,63 @@
+import numpy as np
+from scipy.signal import welch
+
+from physiology.hrv import (
+    HF_BAND, LF_BAND, compute_hr, lf_hf, resample_rr, rmssd, sdnn,
+    sliding_hrv,
+)
+
+
+def _rr(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    beats = np.arange(n)
+    # 0.1 Hz (LF) and 0.25 Hz (HF) modulation of a 75 BPM rhythm
+    return (0.8 + 0.03 * np.sin(2 * np.pi * 0.1 * beats * 0.8)
+            + 0.02 * np.sin(2 * np.pi * 0.25 * beats * 0.8)
+            + 0.005 * rng.standard_normal(n))
+
+
+def test_time_domain_matches_scalar_functions():
+    rr = _rr(120)
+    out = sliding_hrv(rr, window=30, step=7)
+
+    assert len(out) == len(range(0, 120 - 30 + 1, 7))
+    for row in out:
+        win = rr[row["start"]:row["start"] + 30]
+        np.testing.assert_allclose(row["hr"], compute_hr(win), rtol=1e-6)
+        np.testing.assert_allclose(row["rmssd"], rmssd(win), rtol=1e-5)
+        np.testing.assert_allclose(row["sdnn"], sdnn(win), rtol=1e-5)
+    np.testing.assert_allclose(out["t_end"][0], rr[:30].sum())
+
+
+def test_whole_series_window_matches_welch():
+    rr = _rr(200)
+    (row,) = sliding_hrv(rr, window=len(rr), nperseg=128)
+
+    _, signal = resample_rr(rr)
+    freqs, psd = welch(signal, fs=4.0, nperseg=128)
+    lf = psd[(freqs >= LF_BAND[0]) & (freqs < LF_BAND[1])].sum()
+    hf = psd[(freqs >= HF_BAND[0]) & (freqs < HF_BAND[1])].sum()
+
+    np.testing.assert_allclose(row["lf"], lf, rtol=1e-5)
+    np.testing.assert_allclose(row["hf"], hf, rtol=1e-5)
+    np.testing.assert_allclose(row["lf_hf"], lf / hf, rtol=1e-5)
+
+
+def test_short_windows_have_no_spectrum():
+    out = sliding_hrv(_rr(60), window=20, nperseg=128)
+    assert np.isnan(out["lf_hf"]).all()
+    assert np.isfinite(out["rmssd"]).all()
+
+
+def test_too_few_beats_gives_empty_result():
+    assert len(sliding_hrv(_rr(10), window=30)) == 0
+
+
+def test_resampling_is_time_based():
+    rr = np.array([1.0, 0.5, 0.5, 1.0, 1.0])
+    t, values = resample_rr(rr, fs=2.0)
+
+    # Grid runs from the first beat (t=1 s) to before the last (t=4 s)
+    np.testing.assert_allclose(t, [1.0, 1.5, 2.0, 2.5, 3.0, 3.5])
+    np.testing.assert_allclose(values[:3], [1.0, 0.5, 0.5])
+    assert lf_hf(_rr(120)) > 0
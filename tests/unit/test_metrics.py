@@ -0,0 +1,83 @@
+import json
+import time
+import urllib.request
+
+from pipeline.metrics import Metrics, MetricsServer
+
+
+def test_stage_timer_feeds_percentiles_and_histogram():
+    metrics = Metrics(window=10)
+    for ms in range(1, 21):
+        metrics.record("roi", ms / 1e3)
+    with metrics.stage("roi"):
+        pass
+
+    stage = metrics.snapshot()["stages"]["roi"]
+
+    assert stage["count"] == 21
+    # Only the last 10 samples (12..20 ms and ~0) are in the window
+    assert 14 <= stage["p50_ms"] <= 18
+    assert stage["p99_ms"] <= 20.0
+
+    text = metrics.prometheus()
+    assert 'stress_stage_seconds_bucket{stage="roi",le="0.01"} 11' in text
+    assert 'stress_stage_seconds_bucket{stage="roi",le="+Inf"} 21' in text
+    assert 'stress_stage_seconds_count{stage="roi"} 21' in text
+
+
+def test_counters_gauges_and_fps():
+    metrics = Metrics()
+    metrics.count("face_lost_frames")
+    metrics.count("face_lost_frames", 2)
+    metrics.set("dropped_frames", 5)
+    for _ in range(3):
+        metrics.frame()
+        time.sleep(0.01)
+
+    snap = metrics.snapshot()
+    assert snap["counters"] == {"face_lost_frames": 3}
+    assert snap["gauges"] == {"dropped_frames": 5}
+    assert 0 < snap["fps"] < 150
+
+    text = metrics.prometheus()
+    assert "stress_face_lost_frames_total 3" in text
+    assert "stress_dropped_frames 5" in text
+    assert "FPS:" in metrics.summary()
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.stage("decode"):
+        pass
+    metrics.count("face_lost_frames")
+    metrics.frame()
+
+    snap = metrics.snapshot()
+    assert snap["stages"] == {} and snap["counters"] == {}
+    assert snap["fps"] is None
+
+
+def test_jsonl_dump_is_periodic(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(jsonl_path=str(path), dump_interval=0.0)
+    metrics.record("decode", 0.002)
+    metrics.frame()
+    metrics.frame()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["stages"]["decode"]["count"] == 1
+
+
+def test_server_exposes_prometheus_text():
+    metrics = Metrics()
+    metrics.count("face_lost_frames")
+    server = MetricsServer(metrics, port=0).start()
+    try:
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            body = resp.read().decode()
+    finally:
+        server.stop()
+
+    assert "stress_face_lost_frames_total 1" in body
@@ -0,0 +1,36 @@
+import numpy as np
+
+from physiology.peaks import BeatTracker, detect_peaks
+
+FS = 30
+
+
+def _pulse(bpm, seconds=20):
+    t = np.arange(int(seconds * FS)) / FS
+    return np.sin(2 * np.pi * bpm / 60.0 * t)
+
+
+def test_beat_tracker_matches_batch_peaks():
+    signal = _pulse(72)
+    tracker = BeatTracker(FS)
+
+    beats = []
+    for chunk in np.array_split(signal, 50):
+        beats.extend(tracker.update(chunk))
+
+    peaks = detect_peaks(signal, FS)
+    # The last batch peak is still pending confirmation in the tracker
+    np.testing.assert_array_equal(
+        np.round(np.array(beats) * FS), peaks[:len(beats)]
+    )
+    assert len(beats) >= len(peaks) - 1
+
+
+def test_beat_tracker_hr_and_subsample_timing():
+    tracker = BeatTracker(FS)
+    for v in _pulse(75):
+        tracker.update(v)
+
+    assert abs(tracker.hr - 75.0) < 0.5
+    # Interpolated RR intervals resolve the 0.8 s period below 1/FS
+    assert np.all(np.abs(np.array(tracker.rr) - 0.8) < 0.01)
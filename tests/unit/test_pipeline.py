@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from core.landmarks import LANDMARK_REGIONS, NUM_LANDMARKS, landmark_subset
+from core.roi import ROIExtractor, ROIStats
+from pipeline.engine import FrameRing, PipelineEngine
+from pipeline.monitor import StreamMonitor
+
+
+def test_frame_ring_shares_memory_between_handles():
+    ring = FrameRing((4, 5, 3), slots=2)
+    other = FrameRing(ring.shape, 2, name=ring.name)
+
+    ring.frames[1][...] = 7
+    assert other.frames[1].sum() == 7 * 4 * 5 * 3
+
+    other.close()
+    ring.close()
+
+
+def test_pipeline_engine_delivers_every_frame_in_order(make_clip):
+    path = make_clip(n_frames=24, size=(96, 72))
+
+    engine = PipelineEngine(path, slots=3, queue_size=2)
+    results = list(engine.run())
+
+    assert [r["seq"] for r in results] == list(range(24))
+    assert not any(r["face"] for r in results)
+    assert engine.throughput() > 0
+
+
+def test_pipeline_engine_reorders_parallel_landmark_workers(make_clip):
+    path = make_clip(n_frames=30, size=(96, 72))
+
+    engine = PipelineEngine(path, slots=6, queue_size=3, landmark_workers=2)
+    results = list(engine.run())
+
+    assert [r["seq"] for r in results] == list(range(30))
+
+
+def test_pipeline_engine_roi_stage_uses_detector_regions(make_clip):
+    path = make_clip(n_frames=10, size=(96, 72))
+    subset = ["forehead", "left_cheek", "right_cheek", "left_eye"]
+
+    engine = PipelineEngine(path, detector_kwargs={"regions": subset})
+    rows = engine.regions
+    indices, expected = landmark_subset(subset)
+    assert rows.keys() == expected.keys()
+
+    # The ROI stage indexes the subset array with these rows: it must cut
+    # the same ROI as the full mesh whose other points add nothing
+    frame = np.empty((72, 96, 3), dtype=np.uint8)
+    frame[...] = (120, 150, 200)
+    mesh = np.random.default_rng(0).uniform(8, 64, (NUM_LANDMARKS, 2))
+    mesh[np.setdiff1d(np.arange(NUM_LANDMARKS), indices)] = mesh[indices[0]]
+    full_rows = {name: LANDMARK_REGIONS[name] for name in subset}
+
+    stats = ROIExtractor(regions=rows).extract_stats(frame, mesh[indices])
+    full = ROIExtractor(regions=full_rows).extract_stats(frame, mesh)
+    assert stats.count > 0
+    assert stats.count == full.count
+    np.testing.assert_allclose(stats.mean, full.mean)
+
+    assert [r["seq"] for r in engine.run()] == list(range(10))
+
+
+def test_pipeline_engine_raises_when_a_stage_dies(make_clip):
+    path = make_clip(n_frames=10, size=(96, 72))
+
+    engine = PipelineEngine(
+        path, detector_kwargs={"tracker": "not-a-tracker"}
+    )
+    with pytest.raises(RuntimeError, match="landmarks-0"):
+        list(engine.run())
+
+
+def test_stream_monitor_recovers_heart_rate():
+    t = np.arange(30 * 30) / 30
+    green = 140.0 + 0.5 * np.sin(2 * np.pi * 1.2 * t)
+
+    monitor = StreamMonitor(30)
+    for g in green:
+        monitor.update(ROIStats(np.array([100.0, g, 180.0]), 1000, None, None))
+    monitor.update(None)
+
+    assert abs(monitor.hr - 72.0) < 1.0
+    assert monitor.stress is not None
+    assert monitor.frames == len(green) + 1
+    assert monitor.face_frames == len(green)
+
+
+def test_stream_monitor_uses_capture_timestamps():
+    # ~25 FPS with jitter and dropped frames, analysed on a 30 Hz grid
+    rng = np.random.default_rng(0)
+    t = np.cumsum(rng.uniform(0.5, 1.5, 25 * 40) / 25)
+    t = t[rng.random(len(t)) > 0.1]
+    green = 140.0 + 0.5 * np.sin(2 * np.pi * 1.2 * t)
+
+    timed = StreamMonitor(30)
+    naive = StreamMonitor(30)
+    for ti, g in zip(t, green):
+        roi = ROIStats(np.array([100.0, g, 180.0]), 1000, None, None)
+        timed.update(roi, ti)
+        naive.update(roi)
+
+    assert abs(timed.hr - 72.0) < 2.0
+    assert abs(naive.hr - 72.0) > 10.0
+    assert abs(timed.spectral.estimate()[0] - 72.0) < 2.0
+
+
+def test_stream_monitor_restarts_cleanly_after_a_gap():
+    # 72 bpm, a 3 s gap, then 96 bpm at a different skin level
+    t1 = np.arange(20 * 30) / 30
+    t2 = t1[-1] + 3.0 + t1
+    green1 = 140.0 + 0.5 * np.sin(2 * np.pi * 1.2 * t1)
+    green2 = 100.0 + 0.5 * np.sin(2 * np.pi * 1.6 * t2)
+
+    monitor = StreamMonitor(30)
+    for ti, g in zip(t1, green1):
+        roi = ROIStats(np.array([100.0, g, 180.0]), 1000, None, None)
+        monitor.update(roi, ti)
+
+    hrs = []
+    for ti, g in zip(t2, green2):
+        roi = ROIStats(np.array([80.0, g, 150.0]), 1000, None, None)
+        if monitor.update(roi, ti):
+            hrs.append(monitor.hr)
+
+    # Stale samples or filter state would put spurious beats after the gap
+    assert min(hrs) > 71.0
+    assert abs(monitor.hr - 96.0) < 1.0
+    assert abs(monitor.spectral.estimate()[0] - 96.0) < 1.0
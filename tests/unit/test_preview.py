@@ -0,0 +1,38 @@
+import numpy as np
+
+from core.roi import ROIStats
+from ui.preview import render_preview, tint_mask
+
+
+def test_tint_only_touches_masked_pixels():
+    region = np.full((4, 4, 3), 100, dtype=np.uint8)
+    mask = np.zeros((4, 4), dtype=np.uint8)
+    mask[1:3, 1:3] = 255
+
+    tint_mask(region, mask, color=(0, 200, 0), alpha=0.5)
+
+    assert (region[0, 0] == 100).all()
+    assert tuple(region[1, 1]) == (50, 150, 50)
+
+
+def test_preview_is_downscaled_and_leaves_frame_alone():
+    frame = np.full((480, 640, 3), 80, dtype=np.uint8)
+    mask = np.full((100, 100), 255, dtype=np.uint8)
+    roi = ROIStats(np.zeros(3), 100 * 100, (200, 100, 300, 200), mask)
+
+    preview = render_preview(frame, (320, 240), roi=roi)
+
+    assert preview.shape == (240, 320, 3)
+    assert (frame == 80).all()
+    # Tint lands inside the scaled ROI bbox (100..150, 50..100) only
+    assert preview[75, 125, 1] > 80
+    assert (preview[10, 10] == 80).all()
+    assert preview.flags["C_CONTIGUOUS"]
+
+
+def test_preview_draws_scaled_face_box():
+    frame = np.zeros((400, 400, 3), dtype=np.uint8)
+    preview = render_preview(frame, (200, 200), bbox=(100, 100, 300, 300))
+
+    assert tuple(preview[50, 100]) == (255, 0, 0)
+    assert not preview[100, 100].any()
@@ -0,0 +1,58 @@
+import numpy as np
+
+from rppg.resample import StreamingResampler, resample
+
+
+def _jittered_times(n=300, fps=25.0, seed=0):
+    rng = np.random.default_rng(seed)
+    dt = rng.uniform(0.6, 1.4, n) / fps
+    return np.cumsum(dt)
+
+
+def test_resample_onto_uniform_grid():
+    t = _jittered_times()
+    x = np.stack([np.sin(t), np.cos(t)], axis=1)
+
+    grid, out = resample(t, x, 30.0)
+
+    assert grid[0] == t[0] and grid[-1] <= t[-1]
+    np.testing.assert_allclose(np.diff(grid), 1 / 30.0)
+    np.testing.assert_allclose(out[:, 0], np.sin(grid), atol=1e-3)
+    np.testing.assert_allclose(out[:, 1], np.cos(grid), atol=1e-3)
+
+
+def test_resample_leaves_holes_at_long_gaps():
+    t = np.r_[np.arange(30) / 30, 3.0 + np.arange(30) / 30]
+    grid, _ = resample(t, t, 30.0, max_gap=0.5)
+
+    assert not ((grid > 29 / 30 + 1e-9) & (grid < 3.0 - 1e-9)).any()
+    assert len(grid) == 60
+
+
+def test_streaming_matches_batch():
+    t = _jittered_times()
+    x = np.stack([np.sin(3 * t), t], axis=1)
+
+    resampler = StreamingResampler(30.0)
+    parts = [resampler.push(ti, xi) for ti, xi in zip(t, x)]
+    times = np.concatenate([p[0] for p in parts])
+    values = np.concatenate([p[1] for p in parts])
+
+    grid, expected = resample(t, x, 30.0)
+    np.testing.assert_allclose(times, grid)
+    np.testing.assert_allclose(values, expected)
+
+
+def test_streaming_restarts_after_gap():
+    resampler = StreamingResampler(10.0, max_gap=0.5)
+    resampler.push(0.0, 1.0)
+    times, _ = resampler.push(0.35, 2.0)
+    assert len(times) == 3 and not resampler.restarted
+
+    times, values = resampler.push(2.0, 5.0)
+    assert resampler.restarted
+    np.testing.assert_array_equal(times, [2.0])
+    np.testing.assert_array_equal(values, [5.0])
+
+    times, _ = resampler.push(1.9, 0.0)
+    assert len(times) == 0
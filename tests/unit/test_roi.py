@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 from core.face import FaceLandmarkDetector
+from core.landmarks import LANDMARK_REGIONS
 from core.roi import ROIExtractor
 
 def test_roi_extraction():
@@ -13,3 +14,111 @@ def test_roi_extraction():
 
     assert roi_pixels.shape[0] > 1000
     assert mask.sum() > 0
+
+
+def _synthetic_face(seed=0, offset=(200, 120)):
+    rng = np.random.default_rng(seed)
+    img = np.empty((480, 640, 3), dtype=np.uint8)
+    img[:] = (110, 140, 190)
+    img += rng.integers(0, 20, img.shape, dtype=np.uint8)
+    landmarks = rng.integers(0, 240, (468, 2)) + offset
+    return img, landmarks
+
+
+def test_roi_stats_match_pixel_path():
+    roi_extractor = ROIExtractor()
+
+    for offset in [(200, 120), (500, 350), (-60, -40)]:
+        img, landmarks = _synthetic_face(offset=offset)
+        roi_pixels, _ = roi_extractor.extract(img, landmarks)
+        stats = roi_extractor.extract_stats(img, landmarks)
+
+        assert stats.count == roi_pixels.shape[0]
+        np.testing.assert_allclose(stats.mean, roi_pixels.mean(axis=0))
+
+
+def test_region_stats_partition_combined_stats():
+    roi_extractor = ROIExtractor()
+    img, landmarks = _synthetic_face()
+
+    combined = roi_extractor.extract_stats(img, landmarks)
+    regions = roi_extractor.extract_region_stats(img, landmarks)
+
+    counts = np.array([r.count for r in regions])
+    means = np.array([r.mean for r in regions])
+
+    assert counts.sum() == combined.count
+    np.testing.assert_allclose(
+        (means * counts[:, None]).sum(axis=0) / counts.sum(), combined.mean
+    )
+
+
+def test_mask_template_reused_within_quantum():
+    img, landmarks = _synthetic_face()
+    cached = ROIExtractor(mask_quantum=64)
+    fresh = ROIExtractor(mask_quantum=0)
+
+    first = cached.extract_stats(img, landmarks)
+    np.testing.assert_array_equal(
+        first.mask, fresh.extract_stats(img, landmarks).mask
+    )
+
+    # Same quantised bbox: the first crop and template are reused
+    again = cached.extract_stats(img, landmarks + 2)
+    assert again.bbox == first.bbox
+    np.testing.assert_array_equal(again.mask, first.mask)
+    assert len(cached._templates) == 1
+
+    moved = cached.extract_stats(img, landmarks + 100)
+    assert moved.bbox[0] == first.bbox[0] + 100
+    assert len(cached._templates) == 2
+
+
+def test_eyes_and_mouth_use_mesh_indices():
+    img = np.full((480, 640, 3), (110, 140, 190), dtype=np.uint8)
+    landmarks = np.zeros((468, 2), dtype=np.int32)
+    landmarks[:] = (300, 300)
+    landmarks[0] = (200, 100)
+    landmarks[1] = (400, 400)
+
+    # Put the left eye polygon over the middle of the forehead box
+    eye = LANDMARK_REGIONS["left_eye"]
+    angle = np.linspace(0, 2 * np.pi, len(eye), endpoint=False)
+    landmarks[eye] = np.stack(
+        [300 + 20 * np.cos(angle), 140 + 10 * np.sin(angle)], axis=1
+    )
+
+    _, mask = ROIExtractor().extract(img, landmarks)
+    assert mask[140, 300] == 0
+    assert mask[140, 260] == 255
+
+
+def test_patch_grid_matches_per_patch_masking():
+    img, landmarks = _synthetic_face()
+    patches = ROIExtractor(regions={}).extract_patches(
+        img, landmarks, grid=(4, 6)
+    )
+    assert patches.mean.shape == (24, 3)
+
+    x1, y1, x2, y2 = patches.bbox
+    crop = img[y1:y2, x1:x2]
+    skin = cv2.inRange(
+        cv2.cvtColor(crop, cv2.COLOR_BGR2YCrCb), (0, 133, 77), (255, 173, 127)
+    )
+    ys = np.linspace(0, y2 - y1, 5).astype(int)
+    xs = np.linspace(0, x2 - x1, 7).astype(int)
+
+    for i in range(24):
+        r, c = divmod(i, 6)
+        region = np.s_[ys[r]:ys[r + 1], xs[c]:xs[c + 1]]
+        pixels = crop[region][skin[region] > 0]
+        assert patches.count[i] == len(pixels)
+        np.testing.assert_allclose(patches.mean[i], pixels.mean(axis=0))
+
+
+def test_patch_grid_outside_frame_is_empty():
+    img, landmarks = _synthetic_face(offset=(700, 120))
+    patches = ROIExtractor().extract_patches(img, landmarks)
+
+    assert patches.count.sum() == 0
+    assert patches.mean.shape == (64, 3)
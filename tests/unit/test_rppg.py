@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from core.roi import ROIStats
+from rppg import batch, registry
+from rppg.buffer import RingBuffer
+from rppg.chrom import ChromRPPG
+from rppg.green import GreenRPPG
+from rppg.pbv import PBVRPPG
+from rppg.pos import POSRPPG
+
+
+def _stats(bgr):
+    return ROIStats(np.asarray(bgr, dtype=float), 1000, (0, 0, 1, 1), None)
+
+
+def test_ring_buffer_window_and_stats():
+    rng = np.random.default_rng(0)
+    samples = rng.normal(100.0, 5.0, size=(1000, 3))
+    buf = RingBuffer(64, channels=3)
+
+    for i, s in enumerate(samples):
+        buf.append(s)
+        window = samples[max(0, i - 63):i + 1]
+        np.testing.assert_array_equal(buf.view(), window)
+        np.testing.assert_allclose(buf.mean(), window.mean(axis=0))
+        np.testing.assert_allclose(buf.std(), window.std(axis=0), rtol=1e-6)
+
+    assert buf.view().base is not None
+
+
+def test_ring_buffer_clear_after_wraparound():
+    buf = RingBuffer(4)
+    for v in range(5):
+        buf.append(float(v))
+
+    buf.clear()
+    assert len(buf) == 0
+    buf.append(3.0)
+    assert buf.mean() == 3.0
+
+
+def test_green_rppg_window_is_bounded():
+    rppg = GreenRPPG(30, buffer_size=100)
+    for i in range(250):
+        signal = rppg.update(_stats((10.0, float(i), 30.0)))
+
+    assert len(signal) == 100
+    np.testing.assert_array_equal(signal, np.arange(150, 250))
+
+
+def test_chrom_rppg_matches_full_history_formula():
+    rng = np.random.default_rng(1)
+    bgr = rng.normal(120.0, 2.0, size=(200, 3))
+    rppg = ChromRPPG(30, buffer_size=300)
+
+    for s in bgr:
+        latest = rppg.update(_stats(s))
+    signal = rppg.window()
+
+    r, g, b = bgr[:, 2], bgr[:, 1], bgr[:, 0]
+    X = 3 * r - 2 * g
+    Y = 1.5 * r + g - 1.5 * b
+    expected = X / (np.std(X) + 1e-6) - Y / (np.std(Y) + 1e-6)
+    np.testing.assert_allclose(signal, expected, rtol=1e-6)
+    np.testing.assert_allclose(latest, expected[-1:], rtol=1e-6)
+
+
+def _pulse_trace(hr_bpm=72, fps=30, seconds=20, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(fps * seconds)) / fps
+    pulse = np.sin(2 * np.pi * hr_bpm / 60 * t)
+    # Skin-like (B, G, R) with the pulse strongest in green, plus a
+    # slow common illumination drift and sensor noise
+    base = np.array([110.0, 140.0, 190.0])
+    drift = 1 + 0.02 * np.sin(2 * np.pi * 0.05 * t)
+    bgr = base * drift[:, None] + np.outer(pulse, [0.2, 0.6, 0.3])
+    return bgr + 0.05 * rng.standard_normal(bgr.shape)
+
+
+def _dominant_bpm(signal, fps):
+    freqs = np.fft.rfftfreq(len(signal), 1 / fps)
+    band = (freqs >= 0.7) & (freqs <= 3.0)
+    spectrum = np.abs(np.fft.rfft(signal))
+    return 60 * freqs[band][np.argmax(spectrum[band])]
+
+
+def test_every_registered_method_recovers_hr_in_batch():
+    bgr = _pulse_trace(hr_bpm=72)
+    for name, cls in registry.METHODS.items():
+        signal = cls.process(bgr, 30)
+        assert signal.shape == (len(bgr),), name
+        assert abs(_dominant_bpm(signal, 30) - 72) < 3, name
+
+
+def test_batch_needs_one_full_window():
+    assert POSRPPG.process(_pulse_trace()[:10], 30).shape == (0,)
+
+
+def test_streaming_pos_matches_batch_window():
+    bgr = _pulse_trace(seconds=4)
+    rppg = POSRPPG(30)
+    for s in bgr:
+        window = rppg.update(_stats(s))
+
+    length = batch.window_length(30)
+    cn = batch.temporal_normalise(bgr[-length:])
+    expected = POSRPPG.project(cn[None])[0]
+    np.testing.assert_allclose(window, expected - expected.mean(),
+                               rtol=1e-6, atol=1e-9)
+
+
+def test_registry_lookup():
+    assert isinstance(registry.create("pbv", 30), PBVRPPG)
+    with pytest.raises(ValueError):
+        registry.get_method("nope")
@@ -0,0 +1,69 @@
+import numpy as np
+
+from pipeline.scheduler import StreamScheduler
+
+
+class _FakeDetector:
+    """detect_all() stand-in reporting faces at fixed bounding boxes."""
+
+    def __init__(self, boxes):
+        self.faces = []
+        for x1, y1, x2, y2 in boxes:
+            rng = np.random.default_rng(x1)
+            pts = np.column_stack([
+                rng.integers(x1, x2, 468), rng.integers(y1, y2, 468)
+            ]).astype(np.int32)
+            pts[:2] = ((x1, y1), (x2, y2))
+            self.faces.append((pts, (x1, y1, x2, y2)))
+
+    def detect_all(self, frame):
+        return list(self.faces)
+
+
+def test_streams_are_interleaved_and_kept_in_order(make_clip):
+    sched = StreamScheduler(
+        detectors=2, detector_factory=lambda: _FakeDetector([])
+    )
+    sched.add_stream("a", make_clip(n_frames=12, name="a.avi"))
+    sched.add_stream("b", make_clip(n_frames=8, name="b.avi"))
+
+    results = list(sched.run())
+
+    for name, n in (("a", 12), ("b", 8)):
+        seqs = [r["seq"] for r in results if r["stream"] == name]
+        assert seqs == list(range(n))
+        assert sched.streams[name].frames == n
+    # Fair share: neither stream waits for the other to finish
+    assert {r["stream"] for r in results[:4]} == {"a", "b"}
+
+
+def test_each_face_gets_its_own_signal_chain(make_clip):
+    boxes = [(2, 2, 30, 40), (34, 2, 62, 40)]
+    sched = StreamScheduler(
+        detectors=1, max_faces=2,
+        detector_factory=lambda: _FakeDetector(boxes),
+    )
+    stream = sched.add_stream("room", make_clip(n_frames=5))
+
+    results = list(sched.run())
+
+    assert [f["id"] for f in results[-1]["faces"]] == [0, 1]
+    assert set(stream.monitors) == {0, 1}
+    assert stream.monitors[0] is not stream.monitors[1]
+    assert all(m.frames == 5 for m in stream.monitors.values())
+
+
+def test_lost_faces_are_forgotten(make_clip):
+    sched = StreamScheduler(
+        detectors=1, detector_factory=lambda: _FakeDetector([(2, 2, 30, 40)])
+    )
+    stream = sched.add_stream("a", make_clip(n_frames=2))
+    stream.max_missing = 2
+
+    assert stream.assign(sched.pool.get().faces) == [0]
+    for _ in range(2):
+        assert stream.assign([]) == []
+    assert 0 in stream.monitors
+    stream.assign([])
+    assert stream.monitors == {}
+    stream.close()
@@ -0,0 +1,53 @@
+import io
+import json
+import socket
+import threading
+
+from pipeline.service import HeadlessMonitor, open_sink, parse_source
+
+
+def test_parse_source():
+    assert parse_source("0") == 0
+    assert parse_source("rtsp://cam/1") == "rtsp://cam/1"
+    assert parse_source("clip.avi") == "clip.avi"
+
+
+def test_emits_one_json_line_per_window(make_clip):
+    sink = io.StringIO()
+    video = make_clip(n_frames=75, fps=30)
+
+    emitted = HeadlessMonitor(video, sink, interval=1.0).run()
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert emitted == len(lines) == 3
+    assert [r["frames"] for r in lines] == [30, 30, 15]
+    assert lines[0]["t"] == 1.0
+    for r in lines:
+        # Flat grey frames: no face, so no physiology yet
+        assert r["quality"] == 0.0
+        assert r["hr"] is None and r["stress"] is None
+
+
+def test_tcp_sink(make_clip):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    received = []
+
+    def accept():
+        conn, _ = server.accept()
+        with conn, conn.makefile() as f:
+            received.extend(f)
+
+    reader = threading.Thread(target=accept)
+    reader.start()
+
+    port = server.getsockname()[1]
+    sink = open_sink(f"tcp://127.0.0.1:{port}")
+    HeadlessMonitor(make_clip(n_frames=30), sink).run()
+    sink.close()
+    reader.join(timeout=5)
+    server.close()
+
+    assert len(received) == 1
+    assert json.loads(received[0])["frames"] == 30
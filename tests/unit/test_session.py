@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+from core.roi import ROIStats
+from pipeline.service import HeadlessMonitor
+from pipeline.session import (
+    SessionReader, SessionRecorder, export_report, replay,
+)
+
+
+def _regions(g):
+    return [ROIStats(np.array([100.0, g, 180.0]), 400, None, None)] * 3
+
+
+def _record_pulse(path, seconds=30, fps=30, chunk_frames=64):
+    t = np.arange(seconds * fps) / fps
+    green = 140.0 + 0.5 * np.sin(2 * np.pi * 1.2 * t)
+    with SessionRecorder(path, 2, {"fps": fps, "method": "green"},
+                         chunk_frames=chunk_frames) as rec:
+        for i, (ti, g) in enumerate(zip(t, green)):
+            regions = None if i % 100 == 99 else _regions(g)
+            rec.record(ti, i, regions, (10, 20, 110, 140),
+                       np.array([[i, 1], [2, 3]]), hr=70.0 + i % 5)
+    return t
+
+
+def test_round_trip_and_time_range(tmp_path):
+    path = str(tmp_path / "s.bin")
+    t = _record_pulse(path, seconds=10)
+
+    reader = SessionReader(path)
+    assert reader.header["fps"] == 30
+    assert len(reader) == len(t)
+    assert len(reader.chunks) == -(-len(t) // 64)
+
+    records = reader.read()
+    np.testing.assert_array_equal(records["t"], t)
+    assert records["landmarks"].dtype == np.int16
+    assert records["landmarks"][5, 0, 0] == 5
+    assert not records["found"][99] and records["found"][98]
+    assert np.isnan(records["stress"]).all()
+
+    part = reader.read(2.0, 3.0)
+    assert part["t"][0] == 2.0 and part["t"][-1] == 3.0
+
+
+def test_reader_survives_lost_index_and_torn_chunk(tmp_path):
+    path = str(tmp_path / "s.bin")
+    t = _record_pulse(path, seconds=4)
+    os.remove(path + ".idx")
+    with open(path, "ab") as f:
+        f.write(b"CHNK\x10\x00")
+
+    assert len(SessionReader(path)) == len(t)
+
+    with open(tmp_path / "bad.bin", "wb") as f:
+        f.write(b"not a session")
+    with pytest.raises(ValueError):
+        SessionReader(str(tmp_path / "bad.bin"))
+
+
+def test_replay_recovers_heart_rate(tmp_path):
+    path = str(tmp_path / "s.bin")
+    _record_pulse(path)
+    reader = SessionReader(path)
+
+    beats = replay(reader.read(), reader.header["fps"])
+
+    assert len(beats) > 10
+    assert abs(beats["hr"][-1] - 72.0) < 1.0
+    assert np.isfinite(beats["stress"]).all()
+
+
+def test_export_report(tmp_path):
+    path = str(tmp_path / "s.bin")
+    _record_pulse(path, seconds=10)
+
+    report = export_report(SessionReader(path), str(tmp_path / "out"))
+
+    assert report["frames"] == 300
+    assert report["hr"]["max"] == 74.0
+    assert report["stress"] is None
+    with open(tmp_path / "out" / "report.json") as f:
+        assert json.load(f)["session"]["method"] == "green"
+    with open(tmp_path / "out" / "timeline.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert float(rows[3]["quality"]) == pytest.approx(29 / 30, abs=1e-3)
+
+
+def test_headless_monitor_records_every_frame(make_clip, tmp_path):
+    path = str(tmp_path / "s.bin")
+    video = make_clip(n_frames=40, fps=20)
+
+    HeadlessMonitor(video, io.StringIO(), record=path).run()
+
+    reader = SessionReader(path)
+    records = reader.read()
+    assert reader.header["fps"] == 20
+    assert len(reader.header["landmark_ids"]) == records["landmarks"].shape[1]
+    np.testing.assert_allclose(records["t"], np.arange(40) / 20)
+    assert not records["found"].any()
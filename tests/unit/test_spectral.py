@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from physiology.spectral import SpectralHR
+
+
+def _noisy_pulse(bpm, fs=30, seconds=40, noise=0.5, seed=0):
+    t = np.arange(fs * seconds) / fs
+    rng = np.random.default_rng(seed)
+    pulse = np.sin(2 * np.pi * bpm / 60 * t)
+    return pulse + noise * rng.standard_normal(len(t))
+
+
+@pytest.mark.parametrize("bpm", [48.0, 72.0, 97.3, 150.0])
+def test_spectral_hr_is_sub_bin_accurate(bpm):
+    spectral = SpectralHR(30)
+    spectral.update(_noisy_pulse(bpm))
+    hr, snr = spectral.estimate()
+
+    # One DFT bin is 6 BPM at a 10 s window
+    assert abs(hr - bpm) < 1.0
+    assert snr > 5.0
+
+
+def test_sliding_bins_track_the_full_dft():
+    spectral = SpectralHR(30, window=8.0)
+    x = _noisy_pulse(72, seconds=30, noise=2.0, seed=1)
+
+    # Sample-at-a-time through several exact resyncs
+    for value in x[:-7]:
+        spectral.update(value)
+    spectral.update(x[-7:])
+
+    window = x[-spectral.n:] * np.hanning(spectral.n + 1)[:-1]
+    spectrum = np.abs(np.fft.rfft(window)) ** 2
+    expected = spectral.bins[np.argmax(spectrum[spectral.bins])]
+    assert abs(spectral.estimate()[0] / 60 * spectral.n / 30 - expected) < 1
+
+
+def test_spectral_snr_tracks_noise_and_needs_a_full_window():
+    spectral = SpectralHR(30)
+    spectral.update(np.zeros(299))
+    assert spectral.estimate() == (None, None)
+
+    clean, noisy = SpectralHR(30), SpectralHR(30)
+    clean.update(_noisy_pulse(72, noise=0.1))
+    noisy.update(_noisy_pulse(72, noise=3.0))
+    assert clean.estimate()[1] > noisy.estimate()[1] + 10
@@ -0,0 +1,55 @@
+from collections import deque
+
+import numpy as np
+
+from stress.index import StressScorer, compute_stress_index, stress_series
+
+
+def _session(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    hr = 72 + np.cumsum(rng.normal(0, 1.5, n))
+    rmssd = np.abs(40 + 25 * rng.standard_normal(n))
+    return hr, rmssd
+
+
+def _reference(hr, rmssd, history):
+    window = deque(maxlen=history)
+    out = []
+    for h, r in zip(hr, rmssd):
+        window.append(h)
+        out.append(compute_stress_index(h, r, list(window)))
+    return np.array(out)
+
+
+def test_batch_matches_scalar_formula():
+    hr, rmssd = _session()
+    for history in (60, 12):
+        expected = _reference(hr, rmssd, history)
+        np.testing.assert_array_equal(
+            stress_series(hr, rmssd, history), expected
+        )
+
+
+def test_batch_handles_short_recordings():
+    hr, rmssd = _session(3)
+    np.testing.assert_array_equal(
+        stress_series(hr, rmssd), _reference(hr, rmssd, 60)
+    )
+
+
+def test_incremental_matches_scalar_formula():
+    hr, rmssd = _session(2000)
+    scorer = StressScorer(history=60)
+
+    got = np.array([scorer.update(h, r) for h, r in zip(hr, rmssd)])
+
+    np.testing.assert_allclose(got, _reference(hr, rmssd, 60),
+                               rtol=0, atol=1e-9)
+
+
+def test_incremental_reset():
+    scorer = StressScorer()
+    for h in (70, 80, 90, 100, 110):
+        scorer.update(h, 30.0)
+    scorer.reset()
+    assert scorer.update(70, 30.0) == compute_stress_index(70, 30.0, [70])
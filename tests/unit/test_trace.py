@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+
+from core.trace import TRACE_DTYPE, TraceCache, extract_trace, frame_stats
+from core.video_source import VideoSource
+
+
+def _trace(n, found=True):
+    trace = np.zeros(n, dtype=TRACE_DTYPE)
+    trace["t"] = np.arange(n) / 30.0
+    trace["found"] = found
+    trace["rgb"] = [[10, 20, 30], [20, 40, 60], [30, 60, 90]]
+    trace["count"] = [100, 50, 50]
+    return trace
+
+
+def test_frame_stats_weights_regions_by_pixel_count():
+    stats = frame_stats(_trace(1)[0])
+
+    assert stats.count == 200
+    np.testing.assert_allclose(stats.mean, [17.5, 35.0, 52.5])
+
+
+def test_frame_stats_without_face_is_none():
+    assert frame_stats(_trace(1, found=False)[0]) is None
+
+
+def test_extract_trace_records_every_frame(make_clip):
+    path = make_clip(n_frames=6)
+    trace = extract_trace(path)
+
+    assert trace.dtype == TRACE_DTYPE
+    assert len(trace) == 6
+    assert not trace["found"].any()    # flat grey frames: no face
+    assert np.all(np.diff(trace["t"]) > 0)
+
+    vs = VideoSource(path)
+    vs.open()
+    pts = [p.pts for p in iter(vs.read_packet, None)]
+    vs.release()
+    np.testing.assert_allclose(trace["t"], pts)
+
+
+def test_cache_hit_skips_extraction(tmp_path, make_clip):
+    video = make_clip(n_frames=6)
+    cache = TraceCache(str(tmp_path / "cache"))
+
+    first = cache.load(video)
+    timings = {}
+    second = cache.load(video, timings=timings)
+
+    np.testing.assert_array_equal(first, second)
+    assert timings == {}    # nothing was decoded on the hit
+    assert isinstance(second, np.memmap)
+
+
+def test_cache_key_depends_on_settings_and_content(tmp_path, make_clip):
+    cache = TraceCache(str(tmp_path / "cache"))
+    a = make_clip(n_frames=6, name="a.avi")
+    b = make_clip(n_frames=7, name="b.avi")
+
+    assert cache.key(a) == cache.key(a)
+    assert cache.key(a) != cache.key(a, {"detect_interval": 3})
+    assert cache.key(a) != cache.key(b)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TraceCache(str(tmp_path / "cache"))
+    cache.put("a", _trace(100))
+    cache.max_bytes = 2 * os.path.getsize(cache._entry("a"))
+
+    cache.put("b", _trace(100))
+    os.utime(cache._entry("a"), (0, 0))
+    os.utime(cache._entry("b"), (1, 1))
+    cache.get("a")    # touch: "b" is now the oldest
+    cache.put("c", _trace(100))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
@@ -1,3 +1,7 @@
+import time
+
+import numpy as np
+
 from core.video_source import VideoSource
 
 def test_video_source_open_close():
@@ -6,3 +10,53 @@ def test_video_source_open_close():
     frame = vs.read()
     assert frame is not None
     vs.release()
+
+
+def test_video_source_packets_are_sequenced(make_clip):
+    vs = VideoSource(make_clip())
+    vs.open()
+    packets = []
+    while True:
+        packet = vs.read_packet()
+        if packet is None:
+            break
+        packets.append(packet)
+    vs.release()
+
+    assert [p.seq for p in packets] == list(range(20))
+    assert all(b.timestamp >= a.timestamp for a, b in zip(packets, packets[1:]))
+    assert vs.dropped == 0
+
+
+def test_threaded_video_source_latest_frame_wins(make_clip):
+    vs = VideoSource(make_clip(), threaded=True, buffer_size=2)
+    vs.open()
+    time.sleep(0.5)
+
+    seen = []
+    while True:
+        packet = vs.read_packet(timeout=2.0)
+        if packet is None:
+            break
+        seen.append(packet.seq)
+    vs.release()
+
+    assert seen
+    assert seen == sorted(seen)
+    assert len(seen) + vs.dropped == 20
+
+
+def test_file_packets_carry_media_time(make_clip):
+    vs = VideoSource(make_clip(n_frames=10, fps=20))
+    vs.open()
+    pts = []
+    while True:
+        packet = vs.read_packet()
+        if packet is None:
+            break
+        pts.append(packet.pts)
+    vs.release()
+
+    assert not vs.live
+    assert vs.fps == 20
+    np.testing.assert_allclose(pts, np.arange(10) / 20)
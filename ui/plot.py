@@ -0,0 +1,83 @@
+from collections import deque
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+
+class SeriesPlot(QWidget):
+    """
+    Native strip chart: several series in stacked lanes of one widget,
+    sharing the x axis. append() adds one sample per series and only
+    schedules a repaint, so feeding it costs O(1); each repaint draws at
+    most `history` points per lane. No web engine or network involved.
+    """
+
+    def __init__(self, series, history=60, parent=None):
+        """series: list of (title, colour) pairs, one lane each."""
+        super().__init__(parent)
+        self.history = history
+        self.titles = [title for title, _ in series]
+        self.pens = [QPen(QColor(colour), 2) for _, colour in series]
+        self.data = [deque(maxlen=history) for _ in series]
+
+        self.setMinimumHeight(120 * len(series))
+
+    def append(self, values):
+        """One new value per series (None leaves a lane unchanged)."""
+        for lane, value in zip(self.data, values):
+            if value is not None:
+                lane.append(float(value))
+        self.update()
+
+    def clear(self):
+        for lane in self.data:
+            lane.clear()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#111"))
+
+        lane_h = self.height() / len(self.data)
+        for i, (title, pen, lane) in enumerate(
+            zip(self.titles, self.pens, self.data)
+        ):
+            rect = QRectF(35, i * lane_h + 25, self.width() - 50,
+                          lane_h - 45)
+            self._draw_lane(painter, rect, title, pen, lane)
+        painter.end()
+
+    def _draw_lane(self, painter, rect, title, pen, lane):
+        painter.setPen(QColor("#ddd"))
+        label = title if not lane else f"{title}: {lane[-1]:.1f}"
+        painter.drawText(
+            QRectF(rect.left(), rect.top() - 22, rect.width(), 20),
+            Qt.AlignmentFlag.AlignLeft, label
+        )
+        painter.setPen(QColor("#333"))
+        painter.drawRect(rect)
+
+        if len(lane) < 2:
+            return
+
+        lo, hi = min(lane), max(lane)
+        if hi - lo < 1e-6:
+            lo, hi = lo - 1, hi + 1
+
+        painter.setPen(QColor("#888"))
+        painter.drawText(QRectF(0, rect.top() - 8, 32, 16),
+                         Qt.AlignmentFlag.AlignRight, f"{hi:.0f}")
+        painter.drawText(QRectF(0, rect.bottom() - 8, 32, 16),
+                         Qt.AlignmentFlag.AlignRight, f"{lo:.0f}")
+
+        dx = rect.width() / max(self.history - 1, 1)
+        scale = rect.height() / (hi - lo)
+        x0 = rect.right() - (len(lane) - 1) * dx
+        points = QPolygonF([
+            QPointF(x0 + k * dx, rect.bottom() - (v - lo) * scale)
+            for k, v in enumerate(lane)
+        ])
+        painter.setPen(pen)
+        painter.drawPolyline(points)
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+
+ROI_COLOR = (0, 255, 0)
+BOX_COLOR = (255, 0, 0)
+
+
+def tint_mask(region, mask, color=ROI_COLOR, alpha=0.25):
+    """
+    Blend `color` into `region` (in place) where mask is non-zero. Only
+    the region is touched, so callers pass the ROI bbox, not a frame.
+    """
+    if region.size == 0:
+        return region
+    blended = cv2.addWeighted(
+        region, 1.0 - alpha, np.full_like(region, color), alpha, 0
+    )
+    np.copyto(region, blended, where=mask[..., None] > 0)
+    return region
+
+
+def render_preview(frame, size, bbox=None, roi=None, alpha=0.25):
+    """
+    Preview image of `frame` at size = (width, height): downscale first,
+    then draw the face box and tint the ROI mask within its bbox only.
+    The source frame is not modified; the result stays BGR so it can be
+    wrapped as a QImage.Format_BGR888 without a colour conversion.
+    """
+    h, w = frame.shape[:2]
+    pw, ph = size
+    sx, sy = pw / w, ph / h
+    # Bilinear: INTER_AREA looks marginally better but costs ~6x at 1080p
+    preview = cv2.resize(frame, (pw, ph), interpolation=cv2.INTER_LINEAR)
+
+    if bbox:
+        x1, y1, x2, y2 = bbox
+        cv2.rectangle(
+            preview, (int(x1 * sx), int(y1 * sy)),
+            (int(x2 * sx), int(y2 * sy)), BOX_COLOR, 2
+        )
+
+    if roi is not None and roi.mask is not None:
+        x1, y1, x2, y2 = roi.bbox
+        px1, py1 = int(x1 * sx), int(y1 * sy)
+        px2, py2 = max(int(x2 * sx), px1 + 1), max(int(y2 * sy), py1 + 1)
+        px2, py2 = min(px2, pw), min(py2, ph)
+        if px2 > px1 and py2 > py1:
+            mask = cv2.resize(
+                roi.mask, (px2 - px1, py2 - py1),
+                interpolation=cv2.INTER_NEAREST
+            )
+            tint_mask(preview[py1:py2, px1:px2], mask, alpha=alpha)
+
+    return preview
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import namedtuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.face import FaceLandmarkDetector
+from core.roi import ROIExtractor
+from pipeline.metrics import Metrics
+from pipeline.monitor import StreamMonitor
+
+
+# One analysed frame. roi is the ROIStats (or None); processed is the
+# monotonic time analysis finished, timestamp the capture time.
+FrameResult = namedtuple("FrameResult", [
+    "frame", "seq", "timestamp", "processed", "bbox", "roi",
+    "hr", "rmssd", "stress",
+])
+
+
+class PipelineWorker(QThread):
+    """
+    Runs capture -> landmarks -> ROI -> StreamMonitor off the GUI thread.
+
+    Frames are handed over latest-result-wins: the worker overwrites a
+    single slot and the GUI take()s it at its own render cadence, so a
+    slow repaint never backs up analysis and vice versa. Beats are not
+    subject to that policy; each one is emitted as beat(hr, stress,
+    rmssd) so graphs and summaries never miss a point.
+    """
+
+    beat = pyqtSignal(float, float, float)
+    stream_ended = pyqtSignal()
+
+    def __init__(self, vs, fps, history=60, pace=False, metrics=None,
+                 parent=None):
+        super().__init__(parent)
+        self.vs = vs
+        self.fps = fps
+        self.pace = pace
+        self.metrics = metrics if metrics is not None else Metrics(False)
+
+        self.face = FaceLandmarkDetector()
+        self.roi = ROIExtractor()
+        self.monitor = StreamMonitor(fps, history=history)
+
+        self.superseded = 0
+        self._latest = None
+        self._lock = threading.Lock()
+        self._running = False
+
+    def take(self):
+        """The newest unseen FrameResult, or None if nothing new."""
+        with self._lock:
+            result, self._latest = self._latest, None
+        return result
+
+    def stop(self):
+        self._running = False
+        self.wait()
+        self.vs.release()
+
+    def run(self):
+        self._running = True
+        metrics = self.metrics
+        period = 1.0 / self.fps
+        next_due = time.monotonic()
+
+        while self._running:
+            with metrics.stage("decode"):
+                packet = self.vs.read_packet(timeout=0.5)
+            if packet is None:
+                if self.vs.exhausted:
+                    self.stream_ended.emit()
+                    break
+                continue
+
+            with metrics.stage("landmarks"):
+                landmarks, bbox = self.face.process(packet.frame)
+
+            stats = None
+            if landmarks is None:
+                metrics.count("face_lost_frames")
+            else:
+                with metrics.stage("roi"):
+                    stats = self.roi.extract_stats(packet.frame, landmarks)
+
+            m = self.monitor
+            with metrics.stage("signal"):
+                new_beat = m.update(stats, packet.pts)
+            if new_beat:
+                self.beat.emit(float(m.hr), float(m.stress), float(m.rmssd))
+
+            result = FrameResult(
+                packet.frame, packet.seq, packet.timestamp,
+                time.monotonic(), bbox, stats, m.hr, m.rmssd, m.stress,
+            )
+            with self._lock:
+                if self._latest is not None:
+                    self.superseded += 1
+                self._latest = result
+
+            metrics.set("dropped_frames", self.vs.dropped)
+            metrics.set("superseded_results", self.superseded)
+            metrics.frame()
+
+            # Files play back at their frame rate; live sources pace
+            # themselves by blocking in read_packet()
+            if self.pace:
+                next_due += period
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_due = time.monotonic()